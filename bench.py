@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+"""
+This module benchmarks the Δ-stepping SSP engine against the number of worker processes.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+import os
+import time
+from argparse import ArgumentParser
+from array import array
+
+import numpy as np
+
+from clrs.csr import CsrGraph
+from clrs.mst import PriVert
+from clrs.ssp import sspDeltaStep, sspDijkstra
+
+def randomCsr(n: int, m: int, seed: int) -> CsrGraph:
+  # random directed graph of n vertices and m edges with weights uniform in [0, 1), built directly as CSR arrays
+  rg = np.random.default_rng(seed)
+  src = rg.integers(0, n, m)
+  dst = rg.integers(0, n, m)
+  kk = np.lexsort((dst, src))
+  c = CsrGraph(f"random {n}×{m}")
+  c.vl = [PriVert(str(i)) for i in range(n)]
+  c.vv = {u.tag: u for u in c.vl}
+  c.ids = {u.tag: i for i, u in enumerate(c.vl)}
+  c.off = array("q", np.concatenate(([0], np.cumsum(np.bincount(src, minlength=n)))).astype(np.int64).tobytes())
+  c.dst = array("i", dst[kk].astype(np.int32).tobytes())
+  c.wgt = array("d", rg.random(m).tobytes())
+  c.cls = bytearray(m)
+  return c
+
+if __name__ == '__main__':
+  ap = ArgumentParser(description="Δ-stepping speedup against worker processes")
+  ap.add_argument("--edges", type=int, default=10 ** 7)
+  ap.add_argument("--vertices", type=int, default=10 ** 6)
+  ap.add_argument("--seed", type=int, default=0)
+  ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="most worker processes, doubled from 1")
+  ap.add_argument("--check", action="store_true", help="compare the distances with those of sspDijkstra")
+  a = ap.parse_args()
+  c = randomCsr(a.vertices, a.edges, a.seed)
+  s = c.vl[0]
+  ww = [1]
+  while 2 * ww[-1] <= a.workers: ww.append(2 * ww[-1])
+  t1 = 0.0
+  print(f"{c.tag} on {os.cpu_count()} cores\nworkers  seconds  speedup")
+  for w in ww:
+    t = time.perf_counter()
+    sspDeltaStep(c, s, workers=w)
+    t = time.perf_counter() - t
+    t1 = t1 or t
+    print(f"{w:7d}  {t:7.2f}  {t1 / t:7.2f}")
+  if a.check:
+    dd = [u.dis for u in c.vl]
+    sspDijkstra(c, s)
+    assert (dd == [u.dis for u in c.vl])
+    print("distances match sspDijkstra")
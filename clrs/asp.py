@@ -6,9 +6,18 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from copy import deepcopy
+from heapq import heappop, heappush
 
-from clrs.graph import LstTree, MtxGraph, Vert, WMtx, etagOfIndices, indicesOfETag, makeETag, parseETag
+import numpy as np
+
+from clrs.csr import CsrGraph, csr
+from clrs.ega import tarjan
+from clrs.graph import LstTree, MtxGraph, Vert, WMtx, makeETag, parseETag
 from clrs.mst import WgtEdge
 from clrs.ssp import DijkstraGraph, sspBellmanFord, sspDijkstra
 
@@ -17,8 +26,8 @@ from clrs.util import Infinity, Option, Tag, isNone
 ## ASP directed, weighted graph represented using adjacency matrix
 
 class ASPGraph(MtxGraph):
-  def __init__(self, tag: Tag):
-    super().__init__(tag)
+  def __init__(self, tag: Tag, dtype: type = np.float64):
+    super().__init__(tag, dtype)
 
   def makeVEw(self, vt: [Tag], et: [Tag], ew: {Tag, float}) -> None:
     self.makeV(vt)
@@ -27,9 +36,16 @@ class ASPGraph(MtxGraph):
     for etag in et:
       [utag, vtag] = parseETag(etag)
       e = WgtEdge(self.getV(utag), self.getV(vtag), float(ew[etag]))
-      self.ee[e.tag] = e
-      [i, j] = indicesOfETag(etag)
-      self.ww[i][j] = ew[etag]
+      self.insE(e)
+      self.ww[self.ix[utag], self.ix[vtag]] = ew[etag]
+  def makeEa(self, ii: np.ndarray, jj: np.ndarray, ww: np.ndarray, edges: bool = True) -> None:
+    # insert the edges (ii[k], jj[k]) of weights ww[k], given by vertex indices, into ww in one vectorized store; with
+    # edges=False, only the matrix algorithms see them, which saves making an edge object for each
+    self.ww[ii, jj] = ww
+    self.touch()
+    if edges:
+      vv = self.getVV()
+      for i, j, w in zip(ii.tolist(), jj.tolist(), ww.tolist()): self.insE(WgtEdge(vv[i], vv[j], w))
 
 ## §23.2 The Floyd-Warshall algorithm p.655
 
@@ -39,12 +55,12 @@ def aspFloydWarshall(g: ASPGraph) -> [WMtx, WMtx]:
   np1 = n + 1
   # initialize
   dd = [[]] * np1
-  dd[0] = g.ww
+  dd[0] = [[Infinity if math.isinf(w) else w for w in row] for row in g.ww.tolist()]
   pp = [[]] * np1
   pp[0] = [[]] * n
   for i in r:
     pp[0][i] = [-Infinity] * n  # use -Infinity instead of NIL as used in CLRS; see p.659
-    for j in r: pp[0][i][j] = -Infinity if i == j or g.ww[i][j] == Infinity else i
+    for j in r: pp[0][i][j] = -Infinity if i == j or dd[0][i][j] == Infinity else i
   # discover ASP in graph g
   for k in range(1, np1):
     km1 = k - 1
@@ -56,8 +72,65 @@ def aspFloydWarshall(g: ASPGraph) -> [WMtx, WMtx]:
       for j in r:
         dd[k][i][j] = min(dd[km1][i][j], dd[km1][i][km1] + dd[km1][km1][j])
         pp[k][i][j] = pp[km1][km1][j] if dd[km1][i][j] > dd[km1][i][km1] + dd[km1][km1][j] else pp[km1][i][j]  # see Equation 23.8 p.659
+  g.dd, g.pp = dd[n], pp[n]
   return dd[n], pp[n]
 
+## Floyd-Warshall on a single distance matrix
+
+NIL = -1  # no predecessor, in int32 predecessor matrices
+
+def fwInit(g: ASPGraph) -> [np.ndarray, np.ndarray]:
+  # D(0), a copy of g.ww of the same dtype, and Π(0), an int32 matrix; see Equations 23.1 p.647 and 23.7 p.659
+  dd = g.ww.copy()
+  n = len(dd)
+  pp = np.where(np.isinf(dd) | np.eye(n, dtype=bool), NIL, np.arange(n, dtype=np.int32)[:, None]).astype(np.int32)
+  return dd, pp
+
+def fwRelax(dd: np.ndarray, pp: np.ndarray, ii: slice, jj: slice, kk: range) -> None:
+  # relax the block dd[ii, jj] in place, through the intermediate vertices kk in ascending order; see Equation 23.8 p.659
+  d = dd[ii, jj]
+  p = pp[ii, jj]
+  for k in kk:
+    dk = dd[ii, k, None] + dd[None, k, jj]  # d(i, k) + d(k, j)
+    np.copyto(p, pp[None, k, jj], where=dk < d)
+    np.minimum(d, dk, out=d)
+
+def fwLists(dd: np.ndarray, pp: np.ndarray) -> [WMtx, WMtx]:
+  # list of lists with Infinity for no path and -Infinity for NIL, as returned by aspFloydWarshall
+  return ([[Infinity if np.isinf(d) else d for d in row] for row in dd.tolist()],
+          [[-Infinity if p == NIL else p for p in row] for row in pp.tolist()])
+
+def aspFloydWarshallVec(g: ASPGraph, ndarray: bool = False) -> [WMtx, WMtx]:
+  # vectorized Floyd-Warshall keeping one distance matrix and one predecessor matrix, returned as ndarrays if asked
+  dd, pp = fwInit(g)
+  n = len(dd)
+  fwRelax(dd, pp, slice(0, n), slice(0, n), range(0, n))
+  g.dd, g.pp = dd, pp
+  return (dd, pp) if ndarray else fwLists(dd, pp)
+
+## Blocked Floyd-Warshall
+
+def aspFloydWarshallBlk(g: ASPGraph, b: int = 256, workers: Option[int] = None, ndarray: bool = False) -> [WMtx, WMtx]:
+  # Floyd-Warshall on b×b tiles, so that each relaxation streams cache-sized blocks instead of the whole matrix;
+  # for each diagonal tile kt, relax kt, then the tiles in its row and column, then all the remaining tiles,
+  # with the independent tiles of the last two phases relaxed concurrently on a thread pool; the distances are those of
+  # aspFloydWarshall, but where shortest paths tie, pp is a valid predecessor matrix that may pick another predecessor,
+  # as the remaining tiles see their row and column tiles already relaxed through all of kt
+  dd, pp = fwInit(g)
+  n = len(dd)
+  tt = [slice(lo, min(lo + b, n)) for lo in range(0, n, b)]  # tile ranges
+  with ThreadPoolExecutor(max_workers=workers) as ex:
+    def phase(ij: [(slice, slice)], kk: range) -> None:
+      for f in [ex.submit(fwRelax, dd, pp, ii, jj, kk) for ii, jj in ij]: f.result()
+
+    for kt in tt:
+      kk = range(kt.start, kt.stop)
+      fwRelax(dd, pp, kt, kt, kk)  # diagonal tile
+      phase([(kt, jt) for jt in tt if jt != kt] + [(it, kt) for it in tt if it != kt], kk)  # row and column tiles
+      phase([(it, jt) for it in tt if it != kt for jt in tt if jt != kt], kk)  # remaining tiles
+  g.dd, g.pp = dd, pp
+  return (dd, pp) if ndarray else fwLists(dd, pp)
+
 ## Transitive closure of a directed graph p.659
 
 BMtx = [[bool]]
@@ -69,9 +142,10 @@ def tclosure(g: ASPGraph) -> BMtx:
   # intialize
   tt = [[]] * np1
   tt[0] = [[]] * n
+  vv = g.getVV()
   for i in r:
     tt[0][i] = [[]] * n
-    for j in r: tt[0][i][j] = i == j or g.hasE(etagOfIndices(i, j))
+    for j in r: tt[0][i][j] = i == j or g.hasE(vv[i], vv[j])
   for k in range(1, np1):
     km1 = k - 1
     tt[k] = [[]] * n
@@ -80,6 +154,47 @@ def tclosure(g: ASPGraph) -> BMtx:
       for j in r: tt[k][i][j] = tt[km1][i][j] or (tt[km1][i][km1] and tt[km1][km1][j])
   return tt[n]
 
+## Bit-parallel transitive closure
+
+def unpack(tt: [int], n: int) -> BMtx:
+  # unpack rows of bits into rows of booleans; bit j of row i is t(i, j)
+  return [[b == "1" for b in reversed(format(t, f"0{n}b"))] for t in tt]
+
+def tclosureBits(g: ASPGraph, packed: bool = False) -> BMtx:
+  # transitive closure with each row of T packed into the bits of an int, so that
+  # t(i, j) = t(i, j) or (t(i, k) and t(k, j)) becomes one row-wide or for each i with t(i, k) set
+  n = g.numVV()
+  # intialize
+  tt = [1 << i for i in range(n)]
+  for e in g.getEE():
+    tt[g.ix[e.u.tag]] |= 1 << g.ix[e.v.tag]
+  for k in range(n):
+    tk = tt[k]
+    for i in range(n):
+      if tt[i] >> k & 1: tt[i] |= tk
+  return tt if packed else unpack(tt, n)
+
+def tclosureScc(g: ASPGraph, packed: bool = False) -> BMtx:
+  # transitive closure of sparse graphs: all vertices of a strongly connected component share one row, and
+  # the rows of the component graph are closed in one pass, taking the components in reverse topological order
+  vv = g.getVV()
+  n = len(vv)
+  cid = tarjan(g)  # successors of a component have smaller ids
+  m = max(cid, default=-1) + 1
+  ci = {u.tag: c for u, c in zip(vv, cid)}
+  rr = [0] * m  # rows of components
+  ss: [{int}] = [set() for _ in range(m)]  # successor components
+  for i, u in enumerate(vv): rr[ci[u.tag]] |= 1 << i
+  for e in g.getEE():
+    a = ci[e.u.tag]
+    b = ci[e.v.tag]
+    if a != b: ss[a].add(b)
+  for c in range(m):
+    for d in ss[c]: rr[c] |= rr[d]
+  tt = [0] * n
+  for i, u in enumerate(vv): tt[i] = rr[ci[u.tag]]
+  return tt if packed else unpack(tt, n)
+
 ## §23.3 Johnson’s algorithm for sparse graphs p.662
 
 JohnsonGraph = DijkstraGraph  # uses PriVert and WgtEdge
@@ -121,4 +236,69 @@ def aspJohnson(g: JohnsonGraph) -> [WMtx, [LstTree]]:
     for v in g.getVV():
       j = int(v.tag) - 1
       dd[i][j] = u.pri + v.dis - u.dis #hv.dis - hu.dis
-  return dd, tt
\ No newline at end of file
+  return dd, tt
+
+## Parallel Johnson's algorithm
+
+def jsReweight(c: CsrGraph) -> [float]:
+  # h(u) = δ(s, u) for a virtual source s with a 0-weight edge to each vertex u, using Bellman-Ford on the arrays of CSR graph c;
+  # stops at the first pass that changes nothing; see p.663
+  n = c.numVV()
+  hh = [0.0] * n
+  for _ in range(n + 1):  # n passes suffice for the n + 1 vertices of the augmented graph
+    changed = False
+    for i in range(n):
+      for k in range(c.off[i], c.off[i + 1]):
+        d = hh[i] + c.wgt[k]
+        if d < hh[c.dst[k]]:
+          hh[c.dst[k]] = d
+          changed = True
+    if not changed: return hh
+  raise Exception("input graph contains a negative-weight cycle")
+
+jsArrays: Option[tuple] = None  # (off, dst, wgt) of the reweighted graph, one read-only copy per worker process
+
+def jsInit(off: array, dst: array, wgt: array) -> None:
+  global jsArrays
+  jsArrays = (off, dst, wgt)
+
+def jsDijkstra(ss: [int]) -> [(int, array, array)]:
+  # distance row and predecessor row from each source i in ss, by Dijkstra on the reweighted arrays
+  off, dst, wgt = jsArrays
+  n = len(off) - 1
+  rr = []
+  for s in ss:
+    dd = [math.inf] * n
+    pp = [NIL] * n
+    dd[s] = 0.0
+    q = [(0.0, s)]
+    while q:
+      d, u = heappop(q)
+      if d > dd[u]: continue  # stale entry of a vertex whose distance has since decreased
+      for k in range(off[u], off[u + 1]):
+        v = dst[k]
+        if (dv := d + wgt[k]) < dd[v]:
+          dd[v] = dv
+          pp[v] = u
+          heappush(q, (dv, v))
+    rr.append((s, array("d", dd), array("i", pp)))
+  return rr
+
+def aspJohnsonPar(g: JohnsonGraph, workers: Option[int] = None) -> [WMtx, WMtx]:
+  # Johnson's algorithm with the Dijkstra runs spread over a process pool; graph g is left untouched, and
+  # the vertex indices of the returned distance and predecessor matrices follow the order of g.getVV()
+  c = csr(g)
+  n = c.numVV()
+  hh = jsReweight(c)
+  # w^(u, v) = w(u, v) + h(u) - h(v); see Equation 23.10 p.663
+  ww = array("d", [c.wgt[k] + hh[i] - hh[c.dst[k]] for i in range(n) for k in range(c.off[i], c.off[i + 1])])
+  m = 4 * (workers or os.cpu_count() or 1)  # several chunks of sources per worker balance the load
+  dd: WMtx = [[]] * n
+  pp: WMtx = [[]] * n
+  with ProcessPoolExecutor(max_workers=workers, initializer=jsInit, initargs=(c.off, c.dst, ww)) as ex:
+    for rr in ex.map(jsDijkstra, [list(range(i, n, m)) for i in range(min(m, n))]):
+      for i, d, p in rr:
+        # δ(u, v) = δ^(u, v) + h(v) - h(u); see p.665
+        dd[i] = [Infinity if math.isinf(d[j]) else d[j] + hh[j] - hh[i] for j in range(n)]
+        pp[i] = [-Infinity if p[j] == NIL else p[j] for j in range(n)]
+  return dd, pp
@@ -5,10 +5,14 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
+import random
 from unittest import TestCase
 
-from clrs.graph import draw
-from clrs.asp import ASPGraph, BMtx, JohnsonGraph, WMtx, aspFloydWarshall, aspJohnson, tclosure
+import numpy as np
+
+from clrs.graph import draw, parseETag
+from clrs.util import Infinity
+from clrs.asp import ASPGraph, BMtx, JohnsonGraph, WMtx, aspFloydWarshall, aspFloydWarshallBlk, aspFloydWarshallVec, aspJohnson, aspJohnsonPar, tclosure, tclosureBits, tclosureScc
 
 ## Floyd-Warshall ASP
 
@@ -45,6 +49,48 @@ class FloydWarshallASPTestCase(TestCase):
     print("  predecessor subgraph")
     for i in range(0, len(pp)): print(f"    {list(map(lambda x: x + 1, pp[i]))}")  # +1 to offset zero-based indices
 
+  def testFloydWarshallVec(self) -> None:
+    dd, pp = aspFloydWarshallVec(self.g)
+    assert (dd == [[0, 1, -3, 2, -4], [3, 0, -4, 1, -1], [7, 4, 0, 5, 3], [2, -1, -5, 0, -2], [8, 5, 1, 6, 0]])  # see Figure 23.4 p.658
+    assert ((dd, pp) == aspFloydWarshall(self.g))
+    print(f"{self.g.tag}\n  vectorized all-pairs shortest paths")
+    for i in range(0, len(dd)): print(f"    {dd[i]}")
+
+  def testFloydWarshallBlk(self) -> None:
+    for b in range(1, 6):
+      assert (aspFloydWarshallBlk(self.g, b=b, workers=2) == aspFloydWarshall(self.g))
+
+  def testFloydWarshallBlkTies(self) -> None:
+    # small integer weights make many shortest paths tie; each predecessor p of j must end a shortest path i ⇝ p → j
+    rg = random.Random(23)
+    for _ in range(50):
+      n = rg.randint(2, 9)
+      vt = [str(i) for i in range(1, n + 1)]
+      et = [f"{u}-{v}" for u in vt for v in vt if u != v and rg.random() < 0.4]
+      ew = {etag: rg.randint(1, 3) for etag in et}
+      g = ASPGraph("Floyd-Warshall ties")
+      g.makeVEw(vt, et, ew)
+      for b in range(1, 4):
+        dd, pp = aspFloydWarshallBlk(g, b=b, workers=2)
+        assert (dd == aspFloydWarshall(g)[0])
+        for i in range(n):
+          for j in range(n):
+            if i == j or dd[i][j] == Infinity: assert (pp[i][j] == -Infinity)
+            else: assert (dd[i][j] == dd[i][pp[i][j]] + ew[f"{vt[pp[i][j]]}-{vt[j]}"])
+
+  def testFloydWarshallMtx(self) -> None:
+    # the same graph, inserted in bulk from index arrays into a float32 weight matrix
+    g = ASPGraph("Floyd-Warshall float32", dtype=np.float32)
+    g.makeV(self.vt)
+    ii, jj = np.array([[int(vtag) - 1 for vtag in parseETag(etag)] for etag in self.et]).T
+    g.makeEa(ii, jj, np.array([self.ew[etag] for etag in self.et], dtype=np.float32))
+    assert (g.ww.dtype == np.float32 and g.numEE() == len(self.et) and np.isinf(g.ww[0, 3]))
+    dd, _ = aspFloydWarshallVec(g, ndarray=True)
+    assert (dd.dtype == np.float32 and dd.tolist() == aspFloydWarshall(self.g)[0])
+    for f in [aspFloydWarshall, aspFloydWarshallVec, aspFloydWarshallBlk]:
+      f(self.g)
+      assert (self.g.pathASP(0, 1) == [0, 4, 3, 2, 1] and self.g.pathASP(2, 2) == [2])  # see Figure 23.4 p.658
+
 ## transitive closure
 
 class TransitiveClosureTestCase(TestCase):
@@ -74,6 +120,22 @@ class TransitiveClosureTestCase(TestCase):
     print(f"{self.g.tag}\n  transitive closure")
     for i in range(0, len(tt)): print(f"    {tt[i]}")
 
+  def testTransitiveClosureBits(self) -> None:
+    tt = tclosure(self.g)
+    assert (tclosureBits(self.g) == tt)
+    assert (tclosureScc(self.g) == tt)
+    assert (tclosureBits(self.g, packed=True) == [0b0001, 0b1111, 0b1111, 0b1111])  # see Figure 23.5 p.660
+
+  def testTransitiveClosureTags(self) -> None:
+    # rows and columns follow the order of the vertices, whatever their tags
+    for vt in [["3", "1", "2"], ["c", "a", "b"]]:
+      g = ASPGraph("Transitive Closure Tags")
+      g.makeVEw(vt, [f"{vt[0]}-{vt[1]}", f"{vt[1]}-{vt[2]}"], {f"{vt[0]}-{vt[1]}": 1, f"{vt[1]}-{vt[2]}": 1})
+      tt = tclosure(g)
+      assert (tt == [[True, True, True], [False, True, True], [False, False, True]])
+      assert (tclosureBits(g) == tt)
+      assert (tclosureScc(g) == tt)
+
 ## Johnson's ASP
 
 class JohnsonTestCase(TestCase):
@@ -108,4 +170,11 @@ class JohnsonTestCase(TestCase):
     draw(self.g, directed=True, label=f"{self.g.tag} reweighted graph").render(f"viz-{self.g.tag}")
     print(f"{self.g.tag}\n  all-pairs shortest paths")
     for i in range(0, len(dd)): print(f"    {dd[i]}")
-    for t in tt: print(t)
\ No newline at end of file
+    for t in tt: print(t)
+
+  def testJohnsonPar(self) -> None:
+    dd, pp = aspJohnsonPar(self.g, workers=2)
+    assert (dd == [[0, 1, -3, 2, -4], [3, 0, -4, 1, -1], [7, 4, 0, 5, 3], [2, -1, -5, 0, -2], [8, 5, 1, 6, 0]])  # see Figure 23.6 p.665
+    assert (pp == [[-Infinity, 2, 3, 4, 0], [3, -Infinity, 3, 1, 0], [3, 2, -Infinity, 1, 0], [3, 2, 3, -Infinity, 0], [3, 2, 3, 4, -Infinity]])
+    print(f"{self.g.tag}\n  parallel all-pairs shortest paths")
+    for i in range(0, len(dd)): print(f"    {dd[i]}")
@@ -0,0 +1,124 @@
+"""
+This module contains a result cache for the shortest-path, spanning-tree, and transitive-closure algorithms of
+Chapters 21 to 23, keyed by graph version.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+import sys
+import weakref
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from clrs.asp import ASPGraph, aspFloydWarshall, tclosure
+from clrs.graph import VE, Vert
+from clrs.mst import MSTGraph, mstKruskal
+from clrs.ssp import SSPGraph, sspDijkstra
+from clrs.util import Option, Tag
+
+## immutable results
+
+class SSPResult(NamedTuple):  # single-source shortest paths from s
+  s: Tag
+  dis: Mapping[Tag, float]  # {v.tag: δ(s, v)}
+  par: Mapping[Tag, Option[Tag]]  # {v.tag: v.par.tag}
+
+  def path(self, vtag: Tag) -> tuple[Tag, ...]:
+    # path s ⇝ v, or () if v is unreachable
+    if self.par[vtag] is None and vtag != self.s: return ()
+    vt = [vtag]
+    while vt[-1] != self.s: vt.append(self.par[vt[-1]])
+    return tuple(reversed(vt))
+
+class ASPResult(NamedTuple):  # all-pairs shortest paths, rows and columns following vt
+  vt: tuple[Tag, ...]
+  dd: tuple[tuple[float, ...], ...]  # distances
+  pp: tuple[tuple[int, ...], ...]  # predecessor indices
+
+class MSTResult(NamedTuple):  # minimum spanning tree
+  ee: tuple[tuple[Tag, Tag, float], ...]  # edges (u.tag, v.tag, weight)
+  wgt: float
+
+class TCResult(NamedTuple):  # transitive closure, rows and columns following vt
+  vt: tuple[Tag, ...]
+  tt: tuple[tuple[bool, ...], ...]
+
+def sizeOf(o: object, seen: Option[set] = None) -> int:
+  # bytes held by o and everything it refers to through tuples, dicts, and mapping proxies, each object counted once
+  seen = set() if seen is None else seen
+  if id(o) in seen: return 0
+  seen.add(id(o))
+  n = sys.getsizeof(o)
+  if isinstance(o, (dict, MappingProxyType)): n += sum([sizeOf(k, seen) + sizeOf(v, seen) for k, v in o.items()])
+  elif isinstance(o, (tuple, list)): n += sum([sizeOf(x, seen) for x in o])
+  return n
+
+## LRU cache
+
+class Cache:  # least-recently-used cache of results, bounded by their total size in bytes
+  def __init__(self, cap: int = 64 << 20):
+    self.cap = cap  # capacity in bytes
+    self.size = 0  # bytes in use
+    self.rr: OrderedDict = OrderedDict()  # {(id(g), g.ver, alg, source): (weak reference to g, result, bytes)}, least recent first
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, g: VE, alg: str, s: Option[Tag] = None) -> Option[NamedTuple]:
+    k = (id(g), g.ver, alg, s)
+    r = self.rr.get(k)
+    if r is None or r[0]() is not g:  # missing, or left by a collected graph whose id has been reused
+      self.misses += 1
+      return None
+    self.rr.move_to_end(k)
+    self.hits += 1
+    return r[1]
+
+  def put(self, g: VE, alg: str, s: Option[Tag], r: NamedTuple) -> NamedTuple:
+    k = (id(g), g.ver, alg, s)
+    if k in self.rr: self.size -= self.rr.pop(k)[2]
+    n = sizeOf(r)
+    if n > self.cap: return r  # would evict everything else, and still not fit
+    self.rr[k] = (weakref.ref(g), r, n)
+    self.size += n
+    while self.size > self.cap: self.size -= self.rr.popitem(last=False)[1][2]
+    return r
+
+  def clear(self) -> None:
+    self.rr.clear()
+    self.size = 0
+
+cache = Cache()  # default cache
+
+## cached algorithms
+
+def cachedDijkstra(g: SSPGraph, s: Vert, c: Cache = cache) -> SSPResult:
+  # a cache miss runs sspDijkstra, which sets v.dis and v.par; a hit leaves the vertices alone
+  r = c.get(g, "dijkstra", s.tag)
+  if r is None:
+    sspDijkstra(g, s)
+    vv = g.getVV()
+    r = c.put(g, "dijkstra", s.tag, SSPResult(s.tag,
+      MappingProxyType({u.tag: u.dis for u in vv}),
+      MappingProxyType({u.tag: None if u.isRoot() else u.par.tag for u in vv})))
+  return r
+
+def cachedFloydWarshall(g: ASPGraph, c: Cache = cache) -> ASPResult:
+  r = c.get(g, "floyd-warshall")
+  if r is None:
+    dd, pp = aspFloydWarshall(g)
+    r = c.put(g, "floyd-warshall", None, ASPResult(tuple(g.vv), tuple(map(tuple, dd)), tuple(map(tuple, pp))))
+  return r
+
+def cachedKruskal(g: MSTGraph, c: Cache = cache) -> MSTResult:
+  r = c.get(g, "kruskal")
+  if r is None:
+    ee = tuple((e.u.tag, e.v.tag, e.wgt) for e in mstKruskal(g).getEE())
+    r = c.put(g, "kruskal", None, MSTResult(ee, sum([w for _, _, w in ee])))
+  return r
+
+def cachedTClosure(g: ASPGraph, c: Cache = cache) -> TCResult:
+  r = c.get(g, "tclosure")
+  if r is None: r = c.put(g, "tclosure", None, TCResult(tuple(g.vv), tuple(map(tuple, tclosure(g)))))
+  return r
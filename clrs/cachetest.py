@@ -0,0 +1,65 @@
+"""
+This module contains tests for the result cache implemented in the cache module.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+from operator import setitem
+from unittest import TestCase
+
+from clrs import asptest, msttest, ssptest
+from clrs.asp import ASPGraph
+from clrs.cache import Cache, cachedDijkstra, cachedFloydWarshall, cachedKruskal, cachedTClosure, sizeOf
+from clrs.mst import MSTGraph, WgtEdge
+from clrs.ssp import DijkstraGraph
+
+## result cache
+
+class CacheTestCase(TestCase):
+  c = Cache()
+
+  def setUp(self) -> None:
+    self.c = Cache()
+
+  def tearDown(self) -> None:
+    pass
+
+  def testDijkstra(self) -> None:
+    t = ssptest.DijkstraSSPTestCase
+    g = DijkstraGraph("Cached Dijkstra")
+    g.makeVEw(t.vt, t.et, t.ew)
+    r = cachedDijkstra(g, g.getV("s"), self.c)
+    assert (dict(r.dis) == {"s": 0, "t": 8, "x": 9, "y": 5, "z": 7} and r.path("x") == ("s", "y", "t", "x"))  # see Figure 22.6(f) p.621
+    for u in g.getVV(): u.dis = -1
+    assert (cachedDijkstra(g, g.getV("s"), self.c) is r and g.getV("x").dis == -1)  # a hit leaves the vertices alone
+    self.assertRaises(TypeError, lambda: setitem(r.dis, "x", 0))
+    g.insE(WgtEdge(g.getV("s"), g.getV("x"), 1.0))  # bumps g.ver
+    r = cachedDijkstra(g, g.getV("s"), self.c)
+    assert (r.dis["x"] == 1.0 and (self.c.hits, self.c.misses) == (1, 2))
+    g.getE("s-x").wgt = 20.0
+    g.touch()  # an in-place change must be recorded explicitly
+    assert (cachedDijkstra(g, g.getV("s"), self.c).dis["x"] == 9)
+
+  def testASP(self) -> None:
+    f = asptest.FloydWarshallASPTestCase
+    g = ASPGraph("Cached Floyd-Warshall")
+    g.makeVEw(f.vt, f.et, f.ew)
+    r = cachedFloydWarshall(g, self.c)
+    assert (r.dd[0] == (0, 1, -3, 2, -4) and cachedFloydWarshall(g, self.c) is r)  # see Figure 23.4 p.658
+    t = asptest.TransitiveClosureTestCase
+    g = ASPGraph("Cached Transitive Closure")
+    g.makeVEw(t.vt, t.et, t.ew)
+    r = cachedTClosure(g, self.c)
+    assert (r.tt[0] == (True, False, False, False) and r.tt[1] == (True, True, True, True))  # see Figure 23.5 p.660
+    assert (cachedTClosure(g, self.c) is r)
+
+  def testLRU(self) -> None:
+    m = msttest.MSTTestCase
+    gg = [MSTGraph(f"Cached Kruskal {i}") for i in range(3)]
+    for g in gg: g.makeVEw(m.vt, m.et, m.ew)
+    n = sizeOf(cachedKruskal(gg[0], self.c))
+    c = Cache(2 * n)  # room for two trees
+    rr = [cachedKruskal(g, c) for g in gg]
+    assert (rr[0].wgt == 37.0 and len(c.rr) == 2 and c.size <= c.cap)  # see Figure 21.4 p.592
+    assert (cachedKruskal(gg[2], c) is rr[2] and cachedKruskal(gg[0], c) is not rr[0])  # the least recent one was evicted
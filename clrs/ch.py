@@ -0,0 +1,186 @@
+"""
+This module contains contraction hierarchies, a preprocessing of the static graphs of
+Chapter 22 Single-Source Shortest Paths for repeated point-to-point queries.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+import heapq
+import json
+
+from clrs.graph import Vert
+from clrs.mst import WgtEdge
+from clrs.ssp import DijkstraGraph, SSPGraph
+from clrs.util import Infinity, Option, Tag
+
+## shortcut edge
+
+class Shortcut(WgtEdge):  # edge (u, v) standing for the shortest path u → m ⇝ v through the contracted vertex m
+  __slots__ = ("mid",)
+  def __init__(self, u: Vert, v: Vert, wgt: float, mid: Vert):
+    super().__init__(u, v, wgt)
+    self.mid = mid
+
+## contraction hierarchy
+
+class CHGraph(DijkstraGraph):  # uses PriVert, WgtEdge, and Shortcut; the original edges plus the shortcuts, ranked by contraction order
+  def __init__(self, tag: Tag):
+    super().__init__(tag)
+    self.rank: {Tag, int} = {}  # {v.tag: position of v in the contraction order}
+    self.up: {Tag, [[Tag, float]]} = {}  # {u.tag: [(v.tag, w)]} for edges (u, v) that lead to a higher rank
+    self.dn: {Tag, [[Tag, float]]} = {}  # {v.tag: [(u.tag, w)]} for edges (u, v) that come from a higher rank
+
+  def index(self) -> None:
+    # split the edges into the upward graph of the forward search and the reversed downward graph of the backward search
+    self.up = {vtag: [] for vtag in self.vv}
+    self.dn = {vtag: [] for vtag in self.vv}
+    for e in self.getEE():
+      if self.rank[e.u.tag] < self.rank[e.v.tag]: self.up[e.u.tag].append((e.v.tag, e.wgt))
+      else: self.dn[e.v.tag].append((e.u.tag, e.wgt))
+
+  def unpack(self, e: WgtEdge) -> [WgtEdge]:
+    # the original edges that shortcut e stands for, in path order
+    ee = []
+    aa = [e]  # edges yet to be unpacked, last first
+    while aa:
+      a = aa.pop()
+      if isinstance(a, Shortcut):
+        aa.append(self.getE(a.mid, a.v))
+        aa.append(self.getE(a.u, a.mid))
+      else: ee.append(a)
+    return ee
+
+## preprocessing
+
+WAdj = dict[Tag, dict[Tag, float]]  # {u.tag: {v.tag: weight}} adjacency of the remaining graph
+
+def witness(oo: WAdj, u: Tag, v: Tag, d: float, lim: int) -> {Tag, float}:
+  # distances from u in the remaining graph oo without vertex v, up to distance d and at most lim settled vertices
+  dd = {u: 0.0}
+  q = [(0.0, u)]
+  n = 0
+  while q and n < lim:
+    du, x = heapq.heappop(q)
+    if du > dd[x]: continue  # stale entry
+    if du > d: break
+    n += 1
+    for y, w in oo[x].items():
+      if y != v and du + w < dd.get(y, Infinity):
+        dd[y] = du + w
+        heapq.heappush(q, (du + w, y))
+  return dd
+
+def shortcuts(oo: WAdj, ii: WAdj, v: Tag, lim: int) -> [[Tag, Tag, float]]:
+  # the shortcuts (u, w) that contracting vertex v needs, one for each path u → v → w without a witness path u ⇝ w as short
+  ss = []
+  for u, wu in ii[v].items():
+    if u == v or not oo[v]: continue
+    dd = witness(oo, u, v, wu + max(oo[v].values()), lim)
+    for w, wv in oo[v].items():
+      if w != u and w != v and dd.get(w, Infinity) > wu + wv: ss.append((u, w, wu + wv))
+  return ss
+
+def chBuild(g: SSPGraph, lim: int = 500) -> CHGraph:
+  # contract the vertices of graph g one at a time, least edge difference first, the edge difference being the number of
+  # shortcuts less the number of edges removed, plus the number of contracted neighbours to spread the contractions;
+  # priorities are updated lazily, by recomputing the least one before contracting its vertex; edge weights must be
+  # non-negative; witness searches settle at most lim vertices, which may only add superfluous shortcuts
+  h = CHGraph(f"{g.tag}⛰")
+  for u in g.getVV(): h.insV(type(u)(u.tag))
+  oo: WAdj = {vtag: {} for vtag in h.vv}  # out edges of the remaining graph
+  ii: WAdj = {vtag: {} for vtag in h.vv}  # in edges of the remaining graph
+  for e in g.getEE():
+    assert (e.wgt >= 0.0)
+    if e.u.tag == e.v.tag: continue  # self-loops are never on shortest paths
+    h.insE(WgtEdge(h.getV(e.u.tag), h.getV(e.v.tag), e.wgt))
+    oo[e.u.tag][e.v.tag] = e.wgt
+    ii[e.v.tag][e.u.tag] = e.wgt
+  cn = {vtag: 0 for vtag in h.vv}  # number of contracted neighbours
+
+  def priority(v: Tag) -> int: return len(shortcuts(oo, ii, v, lim)) - len(oo[v]) - len(ii[v]) + cn[v]
+
+  q = [(priority(vtag), vtag) for vtag in h.vv]
+  heapq.heapify(q)
+  while q:
+    _, v = heapq.heappop(q)
+    p = priority(v)
+    if q and p > q[0][0]:  # stale priority
+      heapq.heappush(q, (p, v))
+      continue
+    h.rank[v] = len(h.rank)
+    for u, w, c in shortcuts(oo, ii, v, lim):
+      if c < oo[u].get(w, Infinity):
+        oo[u][w] = c
+        ii[w][u] = c
+        etag = f"{u}-{w}"
+        if h.hasE(etag): h.delE(h.getE(etag))
+        h.insE(Shortcut(h.getV(u), h.getV(w), c, h.getV(v)))
+    for w in oo.pop(v):
+      ii[w].pop(v)
+      cn[w] += 1
+    for u in ii.pop(v):
+      oo[u].pop(v)
+      cn[u] += 1
+  h.index()
+  return h
+
+## query
+
+def chQuery(h: CHGraph, s: Vert, t: Vert) -> [[Vert], float]:
+  # bidirectional Dijkstra over the upward graph from s and the reversed downward graph from t; each search stops once its
+  # least key reaches μ, the weight of the best path through a vertex settled by both; returns the path s ⇝ t, with the
+  # shortcuts unpacked and its weight summed along the original edges, or [] and Infinity if t is unreachable
+  df = {s.tag: 0.0}  # forward distances
+  db = {t.tag: 0.0}  # backward distances
+  pf: {Tag, Tag} = {}  # forward parents
+  pb: {Tag, Tag} = {}  # backward parents
+  qf = [(0.0, s.tag)]
+  qb = [(0.0, t.tag)]
+  μ = Infinity
+  m: Option[Tag] = None  # meeting vertex
+  while qf or qb:
+    for q, dd, pp, ee, do in [(qf, df, pf, h.up, db), (qb, db, pb, h.dn, df)]:
+      if not q: continue
+      d, x = heapq.heappop(q)
+      if d >= μ: q.clear()  # nothing shorter lies beyond
+      elif d == dd[x]:
+        if x in do and d + do[x] < μ:
+          μ = d + do[x]
+          m = x
+        for y, w in ee[x]:
+          if d + w < dd.get(y, Infinity):
+            dd[y] = d + w
+            pp[y] = x
+            heapq.heappush(q, (d + w, y))
+  if m is None: return [], Infinity
+  vt = [m]
+  while vt[-1] != s.tag: vt.append(pf[vt[-1]])
+  vt.reverse()
+  while vt[-1] != t.tag: vt.append(pb[vt[-1]])
+  vv = [h.getV(s.tag)]
+  wgt = 0.0
+  for i in range(len(vt) - 1):
+    for e in h.unpack(h.getE(h.getV(vt[i]), h.getV(vt[i + 1]))):
+      vv.append(e.v)
+      wgt += e.wgt
+  return vv, wgt
+
+## serialization
+
+def chSave(h: CHGraph, path: str) -> None:
+  # the vertices in contraction order, and the edges as [u, v, weight, mid], with mid None for original edges
+  vt = sorted(h.vv, key=lambda vtag: h.rank[vtag])
+  et = [[e.u.tag, e.v.tag, e.wgt, e.mid.tag if isinstance(e, Shortcut) else None] for e in h.getEE()]
+  with open(path, "w") as f: json.dump({"tag": h.tag, "vt": vt, "et": et}, f)
+
+def chLoad(path: str) -> CHGraph:
+  with open(path) as f: j = json.load(f)
+  h = CHGraph(j["tag"])
+  h.makeV(j["vt"])
+  h.rank = {vtag: i for i, vtag in enumerate(j["vt"])}
+  for utag, vtag, wgt, mtag in j["et"]:
+    if mtag is None: h.insE(WgtEdge(h.getV(utag), h.getV(vtag), wgt))
+    else: h.insE(Shortcut(h.getV(utag), h.getV(vtag), wgt, h.getV(mtag)))
+  h.index()
+  return h
@@ -0,0 +1,56 @@
+"""
+This module contains tests for the contraction hierarchies implemented in the ch module.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from clrs.ch import Shortcut, chBuild, chLoad, chQuery, chSave
+from clrs.ssp import DijkstraGraph, sspDijkstra
+
+## contraction hierarchy
+
+class CHTestCase(TestCase):
+  # Figure 22.6 p.621
+  vt = ["s", "t", "x", "y", "z"]
+  et = [  # directed edges
+    "s-t", "s-y",
+    "t-x", "t-y",
+    "x-z",
+    "y-t", "y-x", "y-z",
+    "z-s", "z-x", ]
+  ew = {
+    "s-t": 10, "s-y": 5,
+    "t-x": 1, "t-y": 2,
+    "x-z": 4,
+    "y-t": 3, "y-x": 9, "y-z": 2,
+    "z-s": 7, "z-x": 6, }
+  g = DijkstraGraph("dummy")
+
+  def setUp(self) -> None:
+    self.g = DijkstraGraph("CH")
+    self.g.makeVEw(self.vt, self.et, self.ew)
+
+  def tearDown(self) -> None:
+    pass
+
+  def testCH(self) -> None:
+    h = chBuild(self.g)
+    print(h)
+    for e in h.getEE():
+      if isinstance(e, Shortcut): print(f"  {e} via {e.mid.tag}")
+    with tempfile.TemporaryDirectory() as d:
+      chSave(h, os.path.join(d, "ch.json"))
+      hh = chLoad(os.path.join(d, "ch.json"))
+    assert (hh.rank == h.rank and sorted(hh.ee) == sorted(h.ee))
+    for s in self.g.getVV():
+      sspDijkstra(self.g, s)
+      for t in self.g.getVV():
+        for k in [h, hh]:
+          pp, w = chQuery(k, k.getV(s.tag), k.getV(t.tag))
+          assert (w == t.dis and pp[0].tag == s.tag and pp[-1].tag == t.tag)
+          assert (sum([self.g.getE(f"{pp[i].tag}-{pp[i + 1].tag}").wgt for i in range(len(pp) - 1)]) == w)
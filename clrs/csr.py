@@ -0,0 +1,178 @@
+"""
+This module contains the compressed sparse row (CSR) representation of the graphs described in
+Chapter 20 Elementary Graph Algorithms.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+from array import array
+from bisect import bisect_left
+
+from clrs.graph import ECls, Edge, LstVE, VE, VSet, Vert, makeETag, parseETag
+from clrs.util import Infinity, Option, Tag
+
+## CSR edge
+
+class CsrEdge(Edge):  # view of edge k leaving vertex i of CSR graph g
+  __slots__ = ("g", "i", "k")
+  def __init__(self, g: "CsrGraph", i: int, k: int):
+    self.g = g
+    self.i = i
+    self.k = k
+  def init(self) -> None: self.cls = ECls.X
+
+  def __eq__(self, e: object) -> bool: return isinstance(e, CsrEdge) and self.g is e.g and self.k == e.k
+  def __hash__(self) -> int: return hash((id(self.g), self.k))
+
+  def __str__(self) -> str: return f"{self.tag}: {self.show()}" if self.isWeighted() or self.isFlow() else super().__str__()
+  def show(self) -> str:
+    if self.isFlow(): return f"{self.flo}{f'/{self.cap}' if self.cap > 0.0 else ''}"
+    if self.isWeighted(): return str(self.wgt) if self.wgt != Infinity else ""
+    return super().show()
+
+  def isWeighted(self) -> bool: return self.g.wgt is not None
+  def isFlow(self) -> bool: return self.g.cap is not None
+  def residual(self) -> float: return self.cap - self.flo
+
+  @property
+  def tag(self) -> Tag: return makeETag(self.u, self.v)
+  @property
+  def u(self) -> Vert: return self.g.vl[self.i]
+  @property
+  def v(self) -> Vert: return self.g.vl[self.g.dst[self.k]]
+
+  @property
+  def cls(self) -> str: return chr(self.g.cls[self.k])
+  @cls.setter
+  def cls(self, c: str) -> None: self.g.cls[self.k] = ord(c)
+
+  @property
+  def wgt(self) -> float: return self.g.wgt[self.k]
+  @wgt.setter
+  def wgt(self, w: float) -> None: self.g.wgt[self.k] = w
+
+  @property
+  def cap(self) -> float: return self.g.cap[self.k]
+  @cap.setter
+  def cap(self, c: float) -> None: self.g.cap[self.k] = c
+
+  @property
+  def flo(self) -> float: return self.g.flo[self.k]
+  @flo.setter
+  def flo(self, f: float) -> None: self.g.flo[self.k] = f
+
+## CSR graph
+
+class CsrGraph(VE):  # frozen graph with dense integer vertex ids; edge attributes live in flat arrays
+  def __init__(self, tag: Tag):
+    super().__init__(tag)
+    self.vl: [Vert] = []  # vertices indexed by id
+    self.vv: VSet = {}  # {tag: vertex}
+    self.ids: {Tag, int} = {}  # {tag: id}
+    self.off = array("q", [0])  # edges leaving vertex i are off[i] until off[i + 1]
+    self.dst = array("i")  # target vertex ids, each row in the order of the out edges of the source graph
+    self.wgt: Option[array] = None  # edge weights of WgtEdge graphs
+    self.cap: Option[array] = None  # edge capacities of FlowEdge graphs
+    self.flo: Option[array] = None  # edge flows of FlowEdge graphs
+    self.cls = bytearray()  # edge classifications
+    self.rev: Option[array] = None  # edge ids grouped by target vertex, built on first use by inE
+    self.roff: Option[array] = None  # edges entering vertex j are rev[roff[j]] until rev[roff[j + 1]]
+    self.src: Option[array] = None  # source vertex id of each edge, built with rev
+    self.srt: Option[array] = None  # edge ids of each row, sorted by target, built on first use by eid
+
+  def makeCSR(self, g: LstVE) -> None:
+    # freeze graph g; vertex ids follow the order of g.getVV(), and each row the order of g.outE, so that traversals
+    # visit the neighbours of a vertex in the same order on both graphs
+    for u in g.getVV():
+      self.ids[u.tag] = len(self.vl)
+      w = type(u)(u.tag)  # fresh vertex of the same kind, e.g. PriVert
+      self.vl.append(w)
+      self.vv[u.tag] = w
+    ee = g.getEE()
+    if ee and hasattr(ee[0], "wgt"): self.wgt = array("d")
+    if ee and hasattr(ee[0], "cap"):
+      self.cap = array("d")
+      self.flo = array("d")
+    rows = [[] for _ in self.vl]
+    for e in ee: rows[self.ids[e.u.tag]].append((self.ids[e.v.tag], e))
+    for row in rows:
+      for j, e in row:
+        self.dst.append(j)
+        if self.wgt is not None: self.wgt.append(e.wgt)
+        if self.cap is not None:
+          self.cap.append(e.cap)
+          self.flo.append(e.flo)
+      self.off.append(len(self.dst))
+    self.cls = bytearray(ord(ECls.X) for _ in self.dst)
+
+  ver = 0  # version of a frozen graph never changes
+
+  def frozen(self) -> None: raise Exception(f"{self.tag} is a frozen CSR graph")
+
+  def makeRev(self) -> None:
+    # reverse index by counting sort of the edges on their targets, O(V + E)
+    n = len(self.vl)
+    self.src = array("i", bytes(4 * len(self.dst)))
+    for i in range(n):
+      for k in range(self.off[i], self.off[i + 1]): self.src[k] = i
+    cnt = [0] * (n + 1)
+    for j in self.dst: cnt[j + 1] += 1
+    for j in range(n): cnt[j + 1] += cnt[j]
+    self.roff = array("q", cnt)
+    self.rev = array("q", bytes(8 * len(self.dst)))
+    for k, j in enumerate(self.dst):
+      self.rev[cnt[j]] = k
+      cnt[j] += 1
+
+  def makeSrt(self) -> None:
+    # edge ids of each row sorted by target, O(E log E)
+    self.srt = array("q", [k for i in range(len(self.vl)) for k in sorted(range(self.off[i], self.off[i + 1]), key=self.dst.__getitem__)])
+
+  def eid(self, i: int, j: int) -> int:
+    # id of edge (i, j), or -1 if there is no such edge; binary search of row i
+    if self.srt is None: self.makeSrt()
+    lo, hi = self.off[i], self.off[i + 1]
+    x = bisect_left(self.srt, j, lo, hi, key=self.dst.__getitem__)
+    return self.srt[x] if x < hi and self.dst[self.srt[x]] == j else -1
+
+  def makeV(self, vt: [Tag]) -> None: self.frozen()
+  def makeE(self, et: [Tag]) -> None: self.frozen()
+
+  def insV(self, v: Vert) -> None: self.frozen()
+  def delV(self, v: Vert) -> None: self.frozen()
+  def dupVV(self, vv: VSet) -> None: self.frozen()
+  def getV(self, vtag: Tag) -> Vert: return self.vv[vtag]
+  def getVV(self) -> [Vert]: return list(self.vl)
+  def numVV(self) -> int: return len(self.vl)
+  def adj(self, u: Vert) -> [Vert]:
+    i = self.ids[u.tag]
+    return [self.vl[j] for j in self.dst[self.off[i]:self.off[i + 1]]]
+  def outE(self, u: Vert) -> [CsrEdge]:
+    i = self.ids[u.tag]
+    return [CsrEdge(self, i, k) for k in range(self.off[i], self.off[i + 1])]
+  def inE(self, v: Vert) -> [CsrEdge]:
+    if self.rev is None: self.makeRev()
+    j = self.ids[v.tag]
+    return [CsrEdge(self, self.src[k], k) for k in self.rev[self.roff[j]:self.roff[j + 1]]]
+  def hasV(self, vtag: Tag) -> bool: return vtag in self.ids
+
+  def insE(self, e: Edge) -> None: self.frozen()
+  def delE(self, e: Edge) -> None: self.frozen()
+  def dupEE(self, ee: {Tag, Edge}) -> None: self.frozen()
+  def getE(self, etag: Tag | Vert, v: Option[Vert] = None) -> CsrEdge:
+    [utag, vtag] = parseETag(etag) if v is None else [etag.tag, v.tag]
+    i = self.ids[utag]
+    k = self.eid(i, self.ids[vtag])
+    if k < 0: raise KeyError(f"{utag}-{vtag}")
+    return CsrEdge(self, i, k)
+  def getEE(self) -> [CsrEdge]: return [CsrEdge(self, i, k) for i in range(len(self.vl)) for k in range(self.off[i], self.off[i + 1])]
+  def numEE(self) -> int: return len(self.dst)
+  def hasE(self, etag: Tag | Vert, v: Option[Vert] = None) -> bool:
+    [utag, vtag] = parseETag(etag) if v is None else [etag.tag, v.tag]
+    return utag in self.ids and vtag in self.ids and self.eid(self.ids[utag], self.ids[vtag]) >= 0
+
+def csr(g: LstVE) -> CsrGraph:
+  c = CsrGraph(f"{g.tag}▦")
+  c.makeCSR(g)
+  return c
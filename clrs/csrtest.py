@@ -0,0 +1,107 @@
+"""
+This module contains tests for the graph representation implemented in the csr module.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+from unittest import TestCase
+
+from clrs.csr import csr
+from clrs.ega import bfs, dfs, scc, tsort
+from clrs.flow import FlowGraph, mfEdmondsKarp
+from clrs.graph import LstGraph, draw
+from clrs.ssp import DijkstraGraph, SSPGraph, sspBellmanFord, sspBidirectional, sspDijkstra
+
+## CSR graph
+
+class CsrGraphTestCase(TestCase):
+  # Figure 20.3 p.557
+  vt = ["s", "r", "t", "u", "v", "w", "x", "y", "z"]
+  et = [
+    "s-r", "s-u", "s-v",
+    "r-s", "r-t", "r-w",
+    "t-r", "t-u",
+    "u-s", "u-t", "u-y",
+    "v-s", "v-w", "v-y",
+    "w-r", "w-v", "w-x", "w-z",
+    "x-w", "x-y", "x-z",
+    "y-u", "y-v", "y-x",
+    "z-w", "z-x", ]
+  g = LstGraph("dummy")
+
+  def setUp(self) -> None:
+    self.g = LstGraph("CSR")
+    self.g.makeVE(self.vt, self.et)
+
+  def tearDown(self) -> None:
+    pass
+
+  def testEGA(self) -> None:
+    c = csr(self.g)
+    assert (c.numVV() == self.g.numVV() and c.numEE() == self.g.numEE())
+    for e in self.g.getEE(): assert (c.hasE(e.tag))
+    bfs(self.g, self.g.getV("s"))
+    bfs(c, c.getV("s"))
+    for u in self.g.getVV(): assert (c.getV(u.tag).dis == u.dis)
+    dfs(self.g)
+    dfs(c)
+    for u in self.g.getVV(): assert ((c.getV(u.tag).dis, c.getV(u.tag).fin) == (u.dis, u.fin))
+    for e in self.g.getEE(): assert (c.getE(e.tag).cls == e.cls)
+    print(c)
+    draw(c, directed=True, label=f"{c.tag} with vertex discovery and finish times").render(f"viz-{c.tag}")
+
+  def testSSP(self) -> None:
+    # Figure 22.4 p.613
+    g = SSPGraph("CSR Bellman-Ford")
+    g.makeVEw(
+      ["s", "t", "x", "y", "z"],
+      ["s-t", "s-y", "t-x", "t-y", "t-z", "x-t", "y-x", "y-z", "z-s", "z-x"],
+      {"s-t": 6, "s-y": 7, "t-x": 5, "t-y": 8, "t-z": -4, "x-t": -2, "y-x": -3, "y-z": 9, "z-s": 2, "z-x": 7})
+    c = csr(g)
+    sspBellmanFord(g, g.getV("s"))
+    p = sspBellmanFord(c, c.getV("s"))
+    for u in g.getVV(): assert (c.getV(u.tag).dis == u.dis)
+    print(p)
+    # Figure 22.6 p.621
+    g = DijkstraGraph("CSR Dijkstra")
+    g.makeVEw(
+      ["s", "t", "x", "y", "z"],
+      ["s-t", "s-y", "t-x", "t-y", "x-z", "y-t", "y-x", "y-z", "z-s", "z-x"],
+      {"s-t": 10, "s-y": 5, "t-x": 1, "t-y": 2, "x-z": 4, "y-t": 3, "y-x": 9, "y-z": 2, "z-s": 7, "z-x": 6})
+    c = csr(g)
+    sspDijkstra(g, g.getV("s"))
+    p = sspDijkstra(c, c.getV("s"))
+    for u in g.getVV(): assert (c.getV(u.tag).dis == u.dis)
+    for u in g.getVV(): assert (sspBidirectional(c, c.getV("s"), c.getV(u.tag))[1] == u.dis)
+    print(p)
+
+  def testMF(self) -> None:
+    # Figure 24.6 p.687
+    fn = FlowGraph("CSR Edmonds-Karp")
+    fn.makeVEc(
+      ["s", "v1", "v2", "v3", "v4", "t"],
+      ["s-v1", "s-v2", "v1-v3", "v2-v1", "v2-v4", "v3-v2", "v3-t", "v4-v3", "v4-t"],
+      {"s-v1": 16, "s-v2": 13, "v1-v3": 12, "v2-v1": 4, "v2-v4": 14, "v3-v2": 9, "v3-t": 20, "v4-v3": 7, "v4-t": 4})
+    c = csr(fn)
+    mfEdmondsKarp(fn, fn.getV("s"), fn.getV("t"))
+    mf = mfEdmondsKarp(c, c.getV("s"), c.getV("t"))
+    for e in fn.getEE(): assert (c.getE(e.tag).flo == e.flo)
+    print(mf)
+    draw(mf, directed=True, label=f"{mf.tag} Maximum Flow Network").render(f"viz-{mf.tag}")
+
+  def testEdgeOrder(self) -> None:
+    # Figure 20.9 p.577, with the edges of each vertex inserted against the order of the vertices; rows keep that order,
+    # so that the depth-first forest, the topological sort, and the components are the same on both graphs
+    g = LstGraph("CSR edge order")
+    g.makeVE(["a", "b", "c", "d", "e", "f", "g", "h"],
+      ["b-f", "b-e", "b-c", "a-b", "c-g", "c-d", "d-h", "d-c", "e-f", "e-a", "f-g", "g-h", "g-f", "h-h"])
+    c = csr(g)
+    for u in g.getVV(): assert ([e.tag for e in c.outE(c.getV(u.tag))] == [e.tag for e in g.outE(u)])
+    for e in g.getEE(): assert (c.getE(e.tag).v.tag == e.v.tag)
+
+    def forest(h: LstGraph) -> [(str, int, int, str)]: return [(u.tag, u.dis, u.fin, u.showParent()) for u in h.getVV()]
+
+    assert (forest(dfs(c)) == forest(dfs(g)))
+    assert ([u.tag for u in tsort(c)] == [u.tag for u in tsort(g)])
+    assert ([x.tag for x in scc(c).getVV()] == [x.tag for x in scc(g).getVV()])
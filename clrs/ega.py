@@ -6,10 +6,10 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
-from typing import Callable, Generic, TypeVar
-from queue import Queue
+from collections import deque
+from typing import Callable, Generic, Iterator, TypeVar
 
-from clrs.graph import ECls, ESet, Edge, LstGraph, LstTree, VCol, Vert, makeETag, parseETag
+from clrs.graph import ECls, ESet, Edge, LstGraph, LstTree, VCol, Vert, parseETag
 from clrs.util import DSet, Infinity, Tag
 
 def egaInit(g: LstGraph) -> None:
@@ -21,30 +21,26 @@ def egaInit(g: LstGraph) -> None:
 ## §20.2 Breadth-first search p.554
 
 def bfs(g: LstGraph, s: Vert) -> LstGraph:
-  def explore() -> LstGraph:
-    if q.empty(): return g
-    u = q.get()
+  # initialize
+  egaInit(g)
+  # s discovered
+  s.par = None
+  s.dis = 0
+  s.col = VCol.Gray
+  # search g
+  q = deque([s])
+  while q:
+    u = q.popleft()
     for v in g.adj(u):
       if v.col == VCol.White:
         # v discovered
         v.par = u
         v.dis = u.dis + 1
         v.col = VCol.Gray
-        q.put(v)
+        q.append(v)
     # u finished
     u.col = VCol.Black
-    return explore()
-
-  # initialize
-  egaInit(g)
-  # s discovered
-  s.par = None
-  s.dis = 0
-  s.col = VCol.Gray
-  # search g
-  q = Queue()
-  q.put(s)
-  return explore()
+  return g
 
 def bft(g: LstGraph, s: Vert) -> LstTree:
   g = bfs(g, s)
@@ -53,20 +49,34 @@ def bft(g: LstGraph, s: Vert) -> LstTree:
     if u == s or not u.isRoot(): t.insV(u)
   for u in t.getVV():
     if not u.isRoot():
-      e = g.getE(makeETag(u.par, u))
+      e = g.getE(u.par, u)
       t.insE(e)
   return t
 
 ## §20.3 Depth-first search p.563
 
 def dfs(g: LstGraph) -> LstGraph:
-  def explore(u: Vert) -> None:
+  def discover(u: Vert) -> None:
     time[0] += 1
     # u discovered
     u.dis = time[0]
     u.col = VCol.Gray
-    for v in g.adj(u):
-      e = g.getE(makeETag(u, v))
+    ss.append((u, iter(g.outE(u))))
+
+  def explore(u: Vert) -> None:
+    # stack ss of (vertex, its unexplored out edges) stands in for the recursion of DFS-VISIT p.565
+    discover(u)
+    while ss:
+      u, ee = ss[-1]
+      e = next(ee, None)
+      if e is None:
+        ss.pop()
+        time[0] += 1
+        # u finished
+        u.fin = time[0]
+        u.col = VCol.Black
+        continue
+      v = e.v
       if v.col == VCol.Black:
         e.cls = ECls.F if u.dis < v.dis else ECls.C
       elif v.col == VCol.Gray:
@@ -74,16 +84,13 @@ def dfs(g: LstGraph) -> LstGraph:
       elif v.col == VCol.White:
         v.par = u
         e.cls = ECls.T
-        explore(v)
-    time[0] += 1
-    # u finished
-    u.fin = time[0]
-    u.col = VCol.Black
+        discover(v)
 
   # initialize
   egaInit(g)
   # search g
   time = [0]  # use array instead of a scalar to allow explore() to mutate time
+  ss: [(Vert, Iterator[Edge])] = []
   for u in g.getVV():
     if u.col == VCol.White: explore(u)
   return g
@@ -94,7 +101,7 @@ def dff(g: LstGraph) -> LstGraph:
   f.dupVV(g.vv)
   for v in f.getVV():
     if not v.isRoot():
-      e = g.getE(makeETag(v.par, v))
+      e = g.getE(v.par, v)
       f.insE(e)
   return f
 
@@ -107,6 +114,7 @@ def tsort(g: LstGraph) -> [Vert]:
 ## §20.5 Strongly connected components
 
 class Comp(Vert):
+  __slots__ = ("vv",)
   def __init__(self, tag: Tag):
     super().__init__(tag)
     self.vv: VSet = {}  # strongly connected vertices
@@ -142,26 +150,88 @@ def sort(g: LstGraph, attr: Callable[[Vert], int], reverse: bool = False) -> Lst
 
 def contract(g: LstGraph, f: LstGraph) -> LstGraph:
   # contract DFS g using DFF f
-  def scv(u: Vert) -> [Vert]:
-    aa = f.adj(u)  # vertex u's adjacent vertices in DFF f
-    return [] if not aa else [v := aa[0], *scv(v)]
-
+  def scv(r: Vert) -> [Vert]:
+    # vertices of the DFF tree rooted at vertex r, in preorder
+    vv = []
+    ss = [r]
+    while ss:
+      u = ss.pop()
+      vv.append(u)
+      ss.extend(reversed(f.adj(u)))  # vertex u's adjacent vertices in DFF f
+    return vv
+
+  # each tree of DFF f holds the strongly connected vertices rooted at a root vertex r of DFS g
+  return condense(g, [scv(r) for r in g.getVV() if r.isRoot()])
+
+def condense(g: LstGraph, cc: [[Vert]]) -> LstGraph:
+  # component graph of graph g whose strongly connected vertices are cc; see p.578
   c = LstGraph(f"{g.tag}₵")  # SCC c
+  xx: [Comp] = []  # components of SCC c
+  ci: {Tag, int} = {}  # {vertex tag: index of its component in xx}
   # create vertices of SCC c
-  for r in [v for v in g.getVV() if v.isRoot()]:  # for each root vertex r in DFS g
-    vv = [r, *scv(r)]  # strongly connected vertices rooted at vertex r
+  for vv in cc:
     x = Comp(makeCTag(vv))  # create component x by merging strongly connected vertices vv
     x.insVV(vv)
     c.insV(x)  # insert component x into SCC c
+    for u in vv: ci[u.tag] = len(xx)
+    xx.append(x)
   # create edges of SCC c
-  cc: [Comp] = c.getVV()  # components of SCC c
-  for x in cc:  # for each component x in SCC c
-    aa: VSet = {}  # adjacent vertices of component x in DFS g
-    vv = x.getVV()  # constituent vertices of component x
-    for u in vv:  # for each constituent vertex u of component x
-      for v in [a for a in g.adj(u) if a not in vv]: aa[v.tag] = v  # for each (u, v) leaving component x
-    for a in aa.values():  # for each adjacent vertex a of component x
-      for y in [b for b in cc if b != x]:  # for every other component y in SCC c
-        if a in y.getVV():  # component y is adjacent to component x
-          c.insE(Edge(x, y))  # insert edge (x, y) into SCC c
-  return c
\ No newline at end of file
+  ee: {(int, int)} = set()  # component pairs already joined by an edge
+  for e in g.getEE():  # for each edge (u, v) of graph g
+    a = ci[e.u.tag]
+    b = ci[e.v.tag]
+    if a != b and (a, b) not in ee:  # (u, v) leaves component xx[a] for component xx[b]
+      ee.add((a, b))
+      c.insE(Edge(xx[a], xx[b]))  # insert edge (x, y) into SCC c
+  return c
+
+## Tarjan's strongly connected components algorithm
+
+def tarjan(g: LstGraph) -> [int]:
+  # component ids of the vertices of graph g, aligned with g.getVV(), found in a single DFS;
+  # components are numbered in reverse topological order of the component graph
+  def discover(i: int) -> None:
+    num[i] = low[i] = k[0]
+    k[0] += 1
+    ss.append(i)
+    on[i] = True
+    cs.append((i, iter(g.outE(vv[i]))))
+
+  vv = g.getVV()
+  n = len(vv)
+  ix = {u.tag: i for i, u in enumerate(vv)}
+  num = [-1] * n  # discovery order
+  low = [-1] * n  # lowest discovery order reachable through the DFS subtree and one back or cross edge
+  cid = [-1] * n  # component ids
+  on = [False] * n  # on stack ss
+  ss: [int] = []  # vertices of the components yet to be completed
+  cs: [(int, Iterator[Edge])] = []  # explicit DFS stack of (vertex, its unexplored out edges)
+  k = [0]  # use array instead of a scalar to allow discover() to mutate k
+  c = 0
+  for r in range(n):
+    if num[r] >= 0: continue
+    discover(r)
+    while cs:
+      i, ee = cs[-1]
+      e = next(ee, None)
+      if e is None:
+        cs.pop()
+        if cs: low[cs[-1][0]] = min(low[cs[-1][0]], low[i])
+        if low[i] == num[i]:  # vertex i is the root of a component
+          while True:
+            j = ss.pop()
+            on[j] = False
+            cid[j] = c
+            if j == i: break
+          c += 1
+        continue
+      j = ix[e.v.tag]
+      if num[j] < 0: discover(j)
+      elif on[j]: low[i] = min(low[i], num[j])
+  return cid
+
+def sccTarjan(g: LstGraph) -> LstGraph:
+  cid = tarjan(g)
+  cc: [[Vert]] = [[] for _ in range(max(cid, default=-1) + 1)]
+  for u, c in zip(g.getVV(), cid): cc[c].append(u)
+  return condense(g, cc)
@@ -8,7 +8,7 @@ Copyright sOnit, Inc. 2023
 from unittest import TestCase
 
 from clrs.graph import LstGraph, draw
-from clrs.ega import bfs, bft, dff, dfs, scc, tsort
+from clrs.ega import bfs, bft, dff, dfs, scc, sccTarjan, tsort
 from clrs.util import Intv
 
 def dummy() -> None: pass
@@ -47,6 +47,15 @@ class BFSTestCase(TestCase):
     print(t)
     draw(t, directed=False, label=f"{t.tag} with vertex discovery times").render(f"viz-{t.tag}")
 
+  def testBFSDeep(self) -> None:
+    # a path far longer than Python's recursion limit
+    n = 5000
+    g = LstGraph("BFS path")
+    g.makeVE([str(i) for i in range(n)], [f"{i}-{i + 1}" for i in range(n - 1)])
+    g = bfs(g, g.getV("0"))
+    assert (g.getV(str(n - 1)).dis == n - 1)
+    assert (len(g.pathSV(g.getV("0"), g.getV(str(n - 1)))) == n)
+
 ## DFS
 
 class DFSTestCase(TestCase):
@@ -84,6 +93,17 @@ class DFSTestCase(TestCase):
     print(f)
     draw(f, directed=True, label=f"{f.tag} with vertex discovery and finish times").render(f"viz-{f.tag}")
 
+  def testDFSDeep(self) -> None:
+    # a path far longer than Python's recursion limit
+    n = 5000
+    g = LstGraph("DFS path")
+    g.makeVE([str(i) for i in range(n)], [f"{i}-{i + 1}" for i in range(n - 1)])
+    g = dfs(g)
+    f = dff(g)
+    assert ((g.getV("0").dis, g.getV("0").fin) == (1, 2 * n))
+    assert (f.isAncestor(g.getV("0"), g.getV(str(n - 1))) and not f.isAncestor(g.getV(str(n - 1)), g.getV("0")))
+    assert ([u.tag for u in tsort(g)] == [str(i) for i in range(n)])
+
 ## TSort
 
 class TSortTestCase(TestCase):
@@ -137,3 +157,11 @@ class SCCTestCase(TestCase):
     c = scc(self.g)
     print(c)
     draw(c, directed=True, label=f"{c.tag} strongly connected components").render(f"viz-{c.tag}")
+
+  def testTarjan(self) -> None:
+    c = sccTarjan(self.g)
+    cc = {frozenset(u.tag for u in x.getVV()) for x in c.getVV()}
+    assert (cc == {frozenset("abe"), frozenset("cd"), frozenset("fg"), frozenset("h")})  # see Figure 20.9(c) p.577
+    assert (cc == {frozenset(u.tag for u in x.getVV()) for x in scc(self.g).getVV()})
+    assert (c.numEE() == 5)  # see Figure 20.9(d) p.577
+    print(c)
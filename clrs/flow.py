@@ -6,13 +6,15 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
+from collections import deque
+
 from clrs.util import Infinity, Tag
-from clrs.graph import Edge, LstGraph, Vert, makeETag, parseETag
-from clrs.ega import bfs
+from clrs.graph import Edge, LstGraph, Vert, parseETag
 
 ## flow edge
 
 class FlowEdge(Edge):
+  __slots__ = ("flo", "cap")
   def __init__(self, u: Vert, v: Vert, cap: float = 0.0):
     super().__init__(u, v)
     self.flo: float = 0.0
@@ -37,49 +39,204 @@ class FlowGraph(LstGraph):  # uses FlowEdge
     for etag in et:
       [utag, vtag] = parseETag(etag)
       e = FlowEdge(self.getV(utag), self.getV(vtag), float(ec[etag]))
-      self.ee[e.tag] = e
+      self.insE(e)
+
+def flowValue(fn: FlowGraph, s: Vert) -> float:
+  # value |f| = Σ f(s, v) - Σ f(v, s) of the flow f in flow network fn
+  return sum([e.flo for e in fn.getEE() if e.u == s]) - sum([e.flo for e in fn.getEE() if e.v == s])
+
+## residual network with paired arcs
+
+class ResNet:  # residual network of flow network fn; arc 2k runs along edge k of fn and arc 2k + 1 against it; see p.677
+  def __init__(self, fn: FlowGraph):
+    self.vv: [Vert] = fn.getVV()
+    self.ix: {Tag, int} = {u.tag: i for i, u in enumerate(self.vv)}
+    self.ee: [FlowEdge] = fn.getEE()
+    self.aa: [[int]] = [[] for _ in self.vv]  # arcs leaving each vertex
+    self.to: [int] = []  # arc heads
+    self.rc: [float] = []  # residual capacities; see Equation 24.2 p.677
+    for e in self.ee:
+      i = self.ix[e.u.tag]
+      j = self.ix[e.v.tag]
+      self.aa[i].append(len(self.to))
+      self.to.append(j)
+      self.rc.append(e.cap - e.flo)
+      self.aa[j].append(len(self.to))
+      self.to.append(i)
+      self.rc.append(e.flo)
+
+  def push(self, a: int, c: float) -> None:
+    # augment flow by c along arc a; see Equation 24.3 p.679
+    self.rc[a] -= c
+    self.rc[a ^ 1] += c
+  def flows(self) -> None:
+    # write the flow back into the edges of the flow network
+    for k, e in enumerate(self.ee): e.flo = self.rc[2 * k + 1]
+
+  def levels(self, s: int) -> [int]:
+    # BFS distances from vertex s over arcs with positive residual capacity, -1 if unreachable
+    lv = [-1] * len(self.vv)
+    lv[s] = 0
+    q = deque([s])
+    while q:
+      u = q.popleft()
+      for a in self.aa[u]:
+        if self.rc[a] > 0.0 and lv[v := self.to[a]] < 0:
+          lv[v] = lv[u] + 1
+          q.append(v)
+    return lv
+  def cut(self, s: int) -> [[Vert], [Vert]]:
+    # cut (S, T) with S the vertices reachable from vertex s; a minimum cut once the flow is maximum; see Theorem 24.6 p.683
+    lv = self.levels(s)
+    return [u for i, u in enumerate(self.vv) if lv[i] >= 0], [u for i, u in enumerate(self.vv) if lv[i] < 0]
 
 ## Edmonds-Karp algorithm p.686-689
 
 def mfEdmondsKarp(fn: FlowGraph, s: Vert, t: Vert) -> FlowGraph:
-  def resNet(fn: FlowGraph) -> FlowGraph:
-    # extract a residual network from flow network fn; see p.677
-    def edgeResCap(fn: FlowGraph, u: Vert, v: Vert) -> float:
-      # compute residual capacity for edge e; see Equation 24.2 p.677
-      uvtag = makeETag(u, v)
-      vutag = makeETag(v, u)
-      if fn.hasE(uvtag): return fn.getE(uvtag).residual()
-      elif fn.hasE(vutag): return fn.getE(vutag).flo
-      else: return 0.0
-
-    rn = FlowGraph(f"{fn.tag}-")
-    rn.dupVV(fn.vv)
-    for u in fn.getVV():
-      for v in fn.getVV():
-        if fn.hasE(makeETag(u, v)) and (r := edgeResCap(fn, u, v)) > 0.0: rn.insE(FlowEdge(u, v, r))
-    return rn
-
-  def augPath(rn: FlowGraph, s: Vert, t: Vert) -> [FlowEdge]:
-    # find an augmenting path from vertex s to vertex t in residual network rn; see p.681
-    vv = list(reversed(rn.pathSV(s, t)))
-    return list(map(lambda uv: rn.getE(makeETag(uv[0], uv[1])), zip(vv, vv[1:])))
-
-  def pathResCap(ap: [FlowEdge]) -> float:
+  def augPath(rn: ResNet, s: int, t: int) -> [int]:
+    # find a shortest augmenting path from vertex s to vertex t in residual network rn; see p.681 and p.686
+    pa = [-1] * len(rn.vv)  # arcs by which BFS reached each vertex
+    q = deque([s])
+    while q and pa[t] < 0:
+      u = q.popleft()
+      for a in rn.aa[u]:
+        if rn.rc[a] > 0.0 and pa[v := rn.to[a]] < 0 and v != s:
+          pa[v] = a
+          q.append(v)
+    ap = []
+    v = t
+    while pa[v] >= 0:
+      ap.append(pa[v])
+      v = rn.to[pa[v] ^ 1]
+    return list(reversed(ap))
+
+  def pathResCap(rn: ResNet, ap: [int]) -> float:
     # residual capacity (the minimum) of augmenting path ap; see p.681
-    if len(ap) == 1: return 0.0;
-    return min([e.residual() for e in ap])
+    return min([rn.rc[a] for a in ap])
 
   # initialize
   for e in fn.getEE(): e.flo = 0.0
+  rn = ResNet(fn)  # the residual network is updated in place as the flow is augmented
+  si = rn.ix[s.tag]
+  ti = rn.ix[t.tag]
   # augment flow
-  while ap := augPath(bfs(resNet(fn), s), s, t):
-    c = pathResCap(ap)
-    for e in ap:
-      if fn.hasE(e.tag):
-        uv = fn.getE(e.tag)
-        uv.flo += c
-      else:
-        vu = fn.getE(makeETag(e.v, e.u))
-        vu.flo -= c
+  while ap := augPath(rn, si, ti):
+    c = pathResCap(rn, ap)
+    for a in ap: rn.push(a, c)
+  rn.flows()
+  fn.tag = f"{fn.tag}➨"
+  return fn
+
+## Dinic's algorithm
+
+def mfDinic(fn: FlowGraph, s: Vert, t: Vert) -> FlowGraph:
+  # initialize
+  for e in fn.getEE(): e.flo = 0.0
+  rn = ResNet(fn)
+  si = rn.ix[s.tag]
+  ti = rn.ix[t.tag]
+  # augment flow by a blocking flow of the level graph, until t is no longer reachable from s
+  while (lv := rn.levels(si))[ti] >= 0:
+    it = [0] * len(rn.vv)  # current arcs
+    while True:
+      ap: [int] = []  # arcs of the level graph path from s to u
+      u = si
+      while u != ti:
+        aa = rn.aa[u]
+        while it[u] < len(aa) and not (rn.rc[aa[it[u]]] > 0.0 and lv[rn.to[aa[it[u]]]] == lv[u] + 1): it[u] += 1
+        if it[u] < len(aa):  # advance along the current arc of u
+          ap.append(aa[it[u]])
+          u = rn.to[ap[-1]]
+        elif ap:  # retreat from dead end u, and skip its arc hereafter
+          u = rn.to[ap.pop() ^ 1]
+          it[u] += 1
+        else: break
+      if u != ti: break  # the flow is blocking
+      c = min([rn.rc[a] for a in ap])
+      for a in ap: rn.push(a, c)
+  rn.flows()
   fn.tag = f"{fn.tag}➨"
   return fn
+
+## FIFO push-relabel algorithm
+
+def mfPushRelabel(fn: FlowGraph, s: Vert, t: Vert) -> [FlowGraph, [Vert], [Vert]]:
+  # push-relabel with FIFO vertex selection, the gap heuristic, and a global relabelling after every n relabels;
+  # returns the maximum flow network and a minimum cut (S, T)
+  def globalRelabel() -> None:
+    # exact heights: distance to t in the residual network, else n + distance to s
+    for v in range(n): h[v] = 2 * n
+    for r, b in ((ti, 0), (si, n)):
+      h[r] = b
+      q = deque([r])
+      while q:
+        v = q.popleft()
+        for a in rn.aa[v]:
+          if rn.rc[a ^ 1] > 0.0 and h[u := rn.to[a]] == 2 * n and u != si:  # arc (u, v) is residual
+            h[u] = h[v] + 1
+            q.append(u)
+    for v in range(len(cnt)): cnt[v] = 0
+    for v in range(n):
+      cnt[h[v]] += 1
+      it[v] = 0
+
+  def relabel(u: int) -> None:
+    oh = h[u]
+    h[u] = min([h[rn.to[a]] for a in rn.aa[u] if rn.rc[a] > 0.0], default=2 * n) + 1
+    it[u] = 0
+    cnt[oh] -= 1
+    cnt[h[u]] += 1
+    if cnt[oh] == 0 and 0 < oh < n:  # gap at height oh: no vertex above it can reach t any more
+      for v in range(n):
+        if oh < h[v] < n:
+          cnt[h[v]] -= 1
+          h[v] = n + 1
+          cnt[h[v]] += 1
+          it[v] = 0
+
+  # initialize
+  for e in fn.getEE(): e.flo = 0.0
+  rn = ResNet(fn)
+  n = len(rn.vv)
+  si = rn.ix[s.tag]
+  ti = rn.ix[t.tag]
+  h = [0] * n  # heights
+  ex = [0.0] * n  # excess flows
+  it = [0] * n  # current arcs
+  cnt = [0] * (2 * n + 2)  # number of vertices at each height
+  for a in rn.aa[si]:  # saturate the arcs leaving s
+    if (c := rn.rc[a]) > 0.0:
+      rn.push(a, c)
+      ex[rn.to[a]] += c
+      ex[si] -= c
+  globalRelabel()
+  q = deque([u for u in range(n) if ex[u] > 0.0 and u != si and u != ti])  # active vertices
+  inq = [False] * n
+  for u in q: inq[u] = True
+  # discharge active vertices in FIFO order
+  nr = 0  # relabels since the last global relabelling
+  while q:
+    u = q.popleft()
+    inq[u] = False
+    while ex[u] > 0.0:
+      if it[u] == len(rn.aa[u]):
+        relabel(u)
+        nr += 1
+        continue
+      a = rn.aa[u][it[u]]
+      v = rn.to[a]
+      if rn.rc[a] > 0.0 and h[u] == h[v] + 1:  # admissible arc
+        d = min(ex[u], rn.rc[a])
+        rn.push(a, d)
+        ex[u] -= d
+        ex[v] += d
+        if not inq[v] and v != si and v != ti:
+          q.append(v)
+          inq[v] = True
+      else: it[u] += 1
+    if nr >= n:
+      globalRelabel()
+      nr = 0
+  rn.flows()
+  fn.tag = f"{fn.tag}➨"
+  return fn, *rn.cut(si)
@@ -7,7 +7,7 @@ Copyright sOnit, Inc. 2023
 
 from unittest import TestCase
 
-from clrs.flow import FlowGraph, mfEdmondsKarp
+from clrs.flow import FlowGraph, flowValue, mfDinic, mfEdmondsKarp, mfPushRelabel
 from clrs.graph import draw
 
 ## Edmonds-Karp maximum flow
@@ -42,5 +42,61 @@ class EdmondsKarpMFTestCase(TestCase):
     s = self.fn.getV("s")
     t = self.fn.getV("t")
     mf = mfEdmondsKarp(self.fn, s, t)
+    assert (flowValue(mf, s) == 23.0)  # see Figure 24.6(f) p.687
     print(mf)
-    draw(mf, directed=True, label=f"{mf.tag} Maximum Flow Network").render(f"viz-{mf.tag}")
\ No newline at end of file
+    draw(mf, directed=True, label=f"{mf.tag} Maximum Flow Network").render(f"viz-{mf.tag}")
+
+## Dinic's maximum flow
+
+class DinicMFTestCase(TestCase):
+  # Figure 24.6 p.687
+  vt = EdmondsKarpMFTestCase.vt
+  et = EdmondsKarpMFTestCase.et
+  ec = EdmondsKarpMFTestCase.ec
+  fn = FlowGraph("dummy")
+
+  def setUp(self) -> None:
+    self.fn = FlowGraph("Dinic")
+    self.fn.makeVEc(self.vt, self.et, self.ec)
+
+  def tearDown(self) -> None:
+    pass
+
+  def testDinic(self) -> None:
+    s = self.fn.getV("s")
+    t = self.fn.getV("t")
+    mf = mfDinic(self.fn, s, t)
+    assert (flowValue(mf, s) == 23.0)  # see Figure 24.6(f) p.687
+    for u in mf.getVV():
+      if u != s and u != t: assert (sum([e.flo for e in mf.getEE() if e.u == u]) == sum([e.flo for e in mf.getEE() if e.v == u]))  # flow conservation
+    for e in mf.getEE(): assert (0.0 <= e.flo <= e.cap)  # capacity constraint
+    print(mf)
+    draw(mf, directed=True, label=f"{mf.tag} Maximum Flow Network").render(f"viz-{mf.tag}")
+
+## push-relabel maximum flow
+
+class PushRelabelMFTestCase(TestCase):
+  # Figure 24.6 p.687
+  vt = EdmondsKarpMFTestCase.vt
+  et = EdmondsKarpMFTestCase.et
+  ec = EdmondsKarpMFTestCase.ec
+  fn = FlowGraph("dummy")
+
+  def setUp(self) -> None:
+    self.fn = FlowGraph("Push-Relabel")
+    self.fn.makeVEc(self.vt, self.et, self.ec)
+
+  def tearDown(self) -> None:
+    pass
+
+  def testPushRelabel(self) -> None:
+    s = self.fn.getV("s")
+    t = self.fn.getV("t")
+    mf, ss, tt = mfPushRelabel(self.fn, s, t)
+    assert (flowValue(mf, s) == 23.0)  # see Figure 24.6(f) p.687
+    assert ({u.tag for u in ss} == {"s", "v1", "v2", "v4"} and {u.tag for u in tt} == {"v3", "t"})
+    assert (sum([e.cap for e in mf.getEE() if e.u in ss and e.v in tt]) == 23.0)  # max-flow min-cut theorem p.683
+    for u in mf.getVV():
+      if u != s and u != t: assert (sum([e.flo for e in mf.getEE() if e.u == u]) == sum([e.flo for e in mf.getEE() if e.v == u]))  # flow conservation
+    print(mf)
+    draw(mf, directed=True, label=f"{mf.tag} Maximum Flow Network").render(f"viz-{mf.tag}")
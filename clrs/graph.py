@@ -6,10 +6,10 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
-from functools import reduce
 from typing import Generic, TypeVar
 
 import graphviz as V
+import numpy as np
 
 from clrs.util import Infinity, Option, Tag, Tagged, isNone, todo
 
@@ -20,12 +20,15 @@ class VCol:
   Gray = "Gray"
   Black = "Black"
 
+NoFin = -Infinity  # finish time of an unfinished vertex, one object shared by all of them
+
 class Vert(Tagged):
+  __slots__ = ("tag", "par", "dis", "fin", "col")
   def __init__(self, tag: Tag):
     super().__init__(tag)
     self.par: Option[Vert] = None
     self.dis = Infinity
-    self.fin = -Infinity
+    self.fin = NoFin
     self.col = VCol.White
   def init(self) -> None: self.__init__(self.tag)
 
@@ -46,13 +49,16 @@ class ECls:
   C = "C"  # cross edge
 
 class Edge(Tagged):
+  __slots__ = ("u", "v", "cls")
   def __init__(self, u: Vert, v: Vert):
-    super().__init__(makeETag(u, v))
     self.u = u
     self.v = v
     self.cls = ECls.X
   def init(self) -> None: self.__init__(self.u, self.v)
 
+  @property
+  def tag(self) -> Tag: return makeETag(self.u, self.v)  # computed on demand rather than stored in every edge
+
   def __str__(self) -> str: return f"{self.tag} {self.showClassification()}"
   def show(self) -> str: return f"{self.showClassification()}"
   def showClassification(self) -> str: return self.cls if self.cls != ECls.X else ""
@@ -93,6 +99,27 @@ class VE(Tagged, Generic[β, ϵ]):  # abstract base for graph and tree types
     return "\n".join([f"  {u}\n    [{neighbors(u)}]" for u in self.getVV()])
   def showEdges(self) -> str: return "\n".join([f"  {e}" for e in self.getEE()])
 
+  def pathSV(self, s: β, v: β) -> [β]:
+    # path from source vertex s to vertex v, listed from v back to s; see p.562
+    vv = []
+    while not (v.isRoot() or v == s):
+      vv.append(v)
+      v = v.par
+    return [*vv, s]
+  def isAncestor(self, u: β, v: β) -> bool:
+    # check if vertex u is the ancestor of vertex v (there exists a path from u ~> v)
+    if u == v: return True  # self-loop
+    aa = [u]  # vertices a known to be reachable from u, whose out edges are yet to be checked
+    seen = {u.tag}
+    while aa:
+      for b in self.adj(aa.pop()):
+        if b == v: return True  # edge a -> v, hence path u ~> v
+        if b.tag not in seen:
+          seen.add(b.tag)
+          aa.append(b)
+    return False
+  def isDescendant(self, v: β, u: β) -> bool: return self.isAncestor(u, v)
+
   # vertex
 
   def insV(self, v: β) -> None: todo()
@@ -102,6 +129,8 @@ class VE(Tagged, Generic[β, ϵ]):  # abstract base for graph and tree types
   def getVV(self) -> [β]: todo()
   def numVV(self) -> int: todo()
   def adj(self, u: β) -> [β]: todo()
+  def outE(self, u: β) -> [ϵ]: todo()
+  def inE(self, u: β) -> [ϵ]: todo()
   def hasV(self, vtag: Tag) -> bool: todo()
 
   # edge
@@ -109,74 +138,119 @@ class VE(Tagged, Generic[β, ϵ]):  # abstract base for graph and tree types
   def insE(self, e: ϵ) -> None: todo()
   def delE(self, e: ϵ) -> None: todo()
   def dupEE(self, ee: ESet) -> None: todo()
-  def getE(self, etag: Tag) -> ϵ: todo()
+  def getE(self, etag: Tag | β, v: Option[β] = None) -> ϵ: todo()  # edge by its tag "u-v", or by its vertices as getE(u, v)
   def getEE(self) -> [ϵ]: todo()
   def numEE(self) -> int: todo()
-  def hasE(self, etag: Tag) -> bool: todo()
+  def hasE(self, etag: Tag | β, v: Option[β] = None) -> bool: todo()
 
 class LstVE(VE):  # adjacency list representation of graphs and trees
   def __init__(self, tag: Tag):
     super().__init__(tag)
     self.vv: VSet = {}
-    self.ee: ESet = {}
+    self.oe: {Tag, {Tag, ϵ}} = {}  # edges, indexed by their vertices {u.tag: {v.tag: (u, v)}}
+    self.ne = 0  # number of edges
+    self.ie: Option[{Tag, [ϵ]}] = None  # in-edge index {v.tag: [(u, v)]}, built on first use by inE
+    self.ver = 0  # version, bumped by every change to the vertices or edges
+
+  def touch(self) -> None:
+    # record a change, also one made in place, e.g. to an edge weight; drops the in-edge index
+    self.ver += 1
+    self.ie = None
+
+  @property
+  def ee(self) -> ESet: return {makeETag(e.u, e.v): e for e in self.getEE()}  # edge set {"u-v": (u, v)}, built on demand
 
   def makeV(self, vt: [Tag]) -> None:
     for vtag in vt: self.vv[vtag] = Vert(vtag)
+    self.touch()
   def makeE(self, et: [Tag]) -> None:
     for etag in et:
       [utag, vtag] = parseETag(etag)
-      e = Edge(self.getV(utag), self.getV(vtag))
-      self.ee[e.tag] = e
-
-  def pathSV(self, s: β, v: β) -> [β]:
-    # path from source vertex s to vertex v; see p.562
-    return [s] if v.isRoot() or v == s else [v, *self.pathSV(s, v.par)]
-  def isAncestor(self, u: β, v: β) -> bool:
-    # check if vertex u is the ancestor of vertex v (there exists a path from u ~> v)
-    def reachable(a: β) -> bool:
-      # check if a can reach v
-      aa = self.adj(a)  # edge a -> v
-      return True if v in aa else reduce(lambda acc, b: acc or reachable(b), aa, False)  # path a ~> v
-    return True if u == v else reachable(u)  # self-loop or path
-  def isDescendant(self, v: β, u: β) -> bool: return self.isAncestor(u, v)
-
-  def insV(self, v: β) -> None: self.vv[v.tag] = v
-  def delV(self, v: β) -> None: self.vv.pop(v.tag)
-  def dupVV(self, vv: VSet) -> None: self.vv = {**vv}
+      self.insE(Edge(self.getV(utag), self.getV(vtag)))
+
+  def insV(self, v: β) -> None:
+    self.vv[v.tag] = v
+    self.touch()
+  def delV(self, v: β) -> None:
+    self.vv.pop(v.tag)
+    self.touch()
+  def dupVV(self, vv: VSet) -> None:
+    self.vv = {**vv}
+    self.touch()
   def getV(self, vtag: Tag) -> β: return self.vv[vtag]
   def getVV(self) -> [β]: return list(self.vv.values())
-  def numVV(self) -> int: return len(self.getVV())
-  def adj(self, u: β) -> [β]: return [self.getV(e.v.tag) for e in self.getEE() if e.u.tag == u.tag]
+  def numVV(self) -> int: return len(self.vv)
+  def adj(self, u: β) -> [β]: return [self.getV(vtag) for vtag in self.oe.get(u.tag, {})]
+  def outE(self, u: β) -> [ϵ]: return list(self.oe.get(u.tag, {}).values())
+  def inE(self, v: β) -> [ϵ]:
+    if self.ie is None:
+      self.ie = {}
+      for e in self.getEE(): self.ie.setdefault(e.v.tag, []).append(e)
+    return list(self.ie.get(v.tag, []))
   def hasV(self, vtag: Tag) -> bool: return vtag in self.vv
 
-  def insE(self, e: ϵ) -> None: self.ee[e.tag] = e
-  def delE(self, e: ϵ) -> None: self.ee.pop(e.tag)
-  def dupEE(self, ee: ESet) -> None: self.ee = {**ee}
-  def getE(self, etag: Tag) -> ϵ: return self.ee[etag]
-  def getEE(self) -> [ϵ]: return list(self.ee.values())
-  def numEE(self) -> int: return len(self.getEE())
-  def hasE(self, etag: Tag) -> bool: return etag in self.ee
+  def insE(self, e: ϵ) -> None:
+    ue = self.oe.setdefault(e.u.tag, {})
+    self.ne += e.v.tag not in ue
+    ue[e.v.tag] = e
+    self.touch()
+  def delE(self, e: ϵ) -> None:
+    self.oe[e.u.tag].pop(e.v.tag)
+    self.ne -= 1
+    self.touch()
+  def dupEE(self, ee: ESet) -> None:
+    self.oe = {}
+    self.ne = 0
+    for e in ee.values(): self.insE(e)
+    self.touch()
+  def getE(self, etag: Tag | β, v: Option[β] = None) -> ϵ:
+    if v is not None: return self.oe[etag.tag][v.tag]
+    [utag, vtag] = parseETag(etag)
+    return self.oe[utag][vtag]
+  def getEE(self) -> [ϵ]: return [e for ue in self.oe.values() for e in ue.values()]
+  def numEE(self) -> int: return self.ne
+  def hasE(self, etag: Tag | β, v: Option[β] = None) -> bool:
+    if v is not None: return v.tag in self.oe.get(etag.tag, {})
+    [utag, vtag] = parseETag(etag)
+    return vtag in self.oe.get(utag, {})
 
 WMtx = [[float]]  # adjacency matrix of edge weights
 
 class MtxVE(LstVE):  # adjacency matrix representation of graphs and trees
-  def __init__(self, tag: Tag):
+  def __init__(self, tag: Tag, dtype: type = np.float64):
     super().__init__(tag)
-    self.ww: WMtx = []  # edge weight matrix
+    self.dtype = dtype  # float64, or float32 to halve the matrix
+    self.ww = np.zeros((0, 0), dtype=dtype)  # edge weight matrix, with np.inf for no edge
+    self.ix: {Tag, int} = {}  # {v.tag: row and column of vertex v in ww}
+    self.dd: Option[WMtx | np.ndarray] = None  # distance matrix of the last all-pairs shortest paths computed
+    self.pp: Option[WMtx | np.ndarray] = None  # predecessor matrix of the last all-pairs shortest paths computed
 
   def pathASP(self, i: int, j: int) -> [int]:
-    if not dd or not pp: raise Exception("shortest paths not yet computed")
-    if self.pp[i][j] == -Infinity: return []
-    elif i == j: return [i]
-    else: return self.pathASP(i, pp[i][j])
+    # indices of the vertices of a shortest path i ⇝ j, or [] if there is none, following the stored predecessor matrix
+    # back from j in O(path length); a negative predecessor, -Infinity or NIL, marks no path; see p.651
+    if isNone(self.pp): raise Exception("shortest paths not yet computed")
+    vv = [j]
+    while j != i:
+      j = int(self.pp[i][j])
+      if j < 0: return []
+      vv.append(j)
+    return vv[::-1]
 
   def makeV(self, vt: [Tag]) -> None:
     for vtag in vt: self.vv[vtag] = Vert(vtag)
-    n = len(vt)
-    r = range(0, n)
+    self.ix = {vtag: i for i, vtag in enumerate(vt)}
+    self.makeW(len(vt))
+  def makeW(self, n: int) -> None:
     # see Equation 23.1 p.647
-    self.ww = [[Infinity] * n for _ in r]
-    for i in r: self.ww[i][i] = 0
+    self.ww = np.full((n, n), np.inf, dtype=self.dtype)
+    np.fill_diagonal(self.ww, 0.0)
+    self.touch()
+  def makeWW(self) -> None:
+    # rebuild ix and ww from the vertices and the weighted edges of a graph built by insV and insE
+    self.ix = {vtag: i for i, vtag in enumerate(self.vv)}
+    self.makeW(len(self.ix))
+    for e in self.getEE(): self.ww[self.ix[e.u.tag], self.ix[e.v.tag]] = e.wgt
+    self.touch()
 
 class LstGraph(LstVE): pass
 
@@ -0,0 +1,179 @@
+"""
+This module contains streaming loaders that build the graphs described in Chapter 20 Elementary Graph Algorithms
+from edge-list, DIMACS, and METIS files, and a binary CSR file format that is opened by memory mapping.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+import mmap
+import struct
+from array import array
+from functools import cached_property
+
+from clrs.csr import CsrGraph, csr
+from clrs.flow import FlowEdge, FlowGraph
+from clrs.graph import Edge, LstVE, MtxVE, VE, VSet, Vert
+from clrs.mst import PriVert, WgtEdge
+from clrs.util import Option, Tag
+
+## streaming loaders
+
+def insVE(g: LstVE, utag: Tag, vtag: Tag, w: Option[float]) -> None:
+  # insert edge (u, v), and its vertices u and v unless already present; graph g decides the kinds of vertex and edge:
+  # FlowEdge with capacity w for FlowGraph, otherwise WgtEdge with weight w, or Edge if there is no weight; a parallel
+  # edge is merged into the one already present, adding its capacity, or keeping the lesser weight
+  for vt in [utag, vtag]:
+    if not g.hasV(vt):
+      if isinstance(g, MtxVE): g.insV(Vert(vt))  # MtxVE.makeV would reset the weight matrix
+      else: g.makeV([vt])
+  u = g.getV(utag)
+  v = g.getV(vtag)
+  if g.hasE(u, v):
+    e = g.getE(u, v)
+    if isinstance(g, FlowGraph): e.cap += 0.0 if w is None else w
+    elif w is not None and isinstance(e, WgtEdge): e.wgt = min(e.wgt, w)
+    g.touch()
+  elif isinstance(g, FlowGraph): g.insE(FlowEdge(u, v, 0.0 if w is None else w))
+  elif w is None: g.insE(Edge(u, v))
+  else: g.insE(WgtEdge(u, v, w))
+
+def loaded(g: LstVE) -> LstVE:
+  if isinstance(g, MtxVE): g.makeWW()
+  return g
+
+def loadEdgeList(path: str, g: LstVE, sep: Option[str] = None, header: bool = False) -> LstVE:
+  # edge list with one edge "u v [w]" per line, or "u,v[,w]" with sep=","; lines starting with # are comments
+  with open(path) as f:
+    if header: next(f, None)
+    for line in f:
+      if not line.strip() or line.startswith("#"): continue
+      ff = [x.strip() for x in line.split(sep)]
+      insVE(g, ff[0], ff[1], float(ff[2]) if len(ff) > 2 and ff[2] else None)
+  return loaded(g)
+
+def loadDimacs(path: str, g: LstVE) -> [LstVE, Option[Vert], Option[Vert]]:
+  # DIMACS shortest-path (.gr: "p sp n m", "a u v w") or maximum-flow (.max: "p max n m", "n v s", "n v t", "a u v c")
+  # file with vertices 1 to n; returns graph g with the source and sink of a flow network, or None for a .gr file
+  st: {str, Tag} = {}  # {"s": source tag, "t": sink tag}
+  with open(path) as f:
+    for line in f:
+      ff = line.split()
+      if not ff or ff[0] == "c": continue
+      if ff[0] == "p":
+        for i in range(1, int(ff[2]) + 1):
+          if isinstance(g, MtxVE): g.insV(Vert(str(i)))
+          else: g.makeV([str(i)])
+      elif ff[0] == "n": st[ff[2]] = ff[1]
+      elif ff[0] == "a": insVE(g, ff[1], ff[2], float(ff[3]) if len(ff) > 3 else None)
+  return loaded(g), g.getV(st["s"]) if "s" in st else None, g.getV(st["t"]) if "t" in st else None
+
+def loadMetis(path: str, g: LstVE) -> LstVE:
+  # METIS graph file: header "n m [fmt [ncon]]", then line i lists the neighbours of vertex i, numbered from 1, each
+  # followed by its edge weight if fmt ends in 1, after the vertex size if fmt has a 1 in the hundreds and ncon vertex
+  # weights if fmt has a 1 in the tens; every undirected edge is listed by both its vertices, and becomes a directed edge
+  # each way; lines starting with % are comments
+  with open(path) as f:
+    hh: [str] = []
+    for line in f:
+      if not line.startswith("%") and (hh := line.split()): break
+    n = int(hh[0])
+    fmt = hh[2].rjust(3, "0") if len(hh) > 2 else "000"
+    ew = fmt[2] == "1"  # edge weights
+    nc = (int(hh[3]) if len(hh) > 3 else 1) if fmt[1] == "1" else 0  # number of vertex weights
+    nc += fmt[0] == "1"  # vertex size
+    for i in range(1, n + 1):
+      if isinstance(g, MtxVE): g.insV(Vert(str(i)))
+      else: g.makeV([str(i)])
+    i = 0
+    for line in f:
+      if line.startswith("%"): continue
+      i += 1
+      ff = line.split()[nc:]  # neighbours, after the vertex size and weights
+      step = 2 if ew else 1
+      for k in range(0, len(ff), step): insVE(g, str(i), ff[k], float(ff[k + 1]) if ew else None)
+  return loaded(g)
+
+## memory-mapped CSR file
+
+# layout, in native byte order, with every section padded to 8 bytes: magic, header (n, m, flags, vertex kind, tag
+# length, tag blob length), graph tag, off (n + 1 int64), tag offsets (n + 1 int64), dst (m int32), then wgt (m float64)
+# if flags has CsrWgt, and cap and flo (m float64 each) if flags has CsrFlo, and finally the vertex tags, utf-8 encoded
+CsrMagic = b"CLRSCSR\x01"
+CsrHeader = struct.Struct("=6q")
+CsrWgt = 1
+CsrFlo = 2
+CsrKinds = [Vert, PriVert]  # vertex classes by kind number
+
+def pad(n: int) -> int: return -n % 8
+
+def saveCsr(g: VE, path: str) -> None:
+  # write graph g, frozen into a CsrGraph unless it is one already
+  c = g if isinstance(g, CsrGraph) else csr(g)
+  n = c.numVV()
+  m = c.numEE()
+  tt = [u.tag.encode() for u in c.vl]
+  toff = array("q", [0])
+  for t in tt: toff.append(toff[-1] + len(t))
+  blob = b"".join(tt)
+  tag = c.tag.encode()
+  flags = (CsrWgt if c.wgt is not None else 0) | (CsrFlo if c.cap is not None else 0)
+  kind = CsrKinds.index(type(c.vl[0])) if c.vl and type(c.vl[0]) in CsrKinds else 0
+  with open(path, "wb") as f:
+    f.write(CsrMagic)
+    f.write(CsrHeader.pack(n, m, flags, kind, len(tag), len(blob)))
+    for a in [tag, array("q", c.off).tobytes(), toff.tobytes(), array("i", c.dst).tobytes()]:
+      f.write(a)
+      f.write(bytes(pad(len(a))))
+    if flags & CsrWgt: f.write(array("d", c.wgt).tobytes())
+    if flags & CsrFlo:
+      f.write(array("d", c.cap).tobytes())
+      f.write(array("d", c.flo).tobytes())
+    f.write(blob)
+
+class MapGraph(CsrGraph):  # CsrGraph whose arrays are views of a memory-mapped file; vertices are made on first use
+  def __init__(self, path: str):
+    with open(path, "rb") as f: self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)  # writes stay private
+    if self.mm[:len(CsrMagic)] != CsrMagic: raise Exception(f"{path} is not a CSR graph file")
+    buf = memoryview(self.mm)
+    o = len(CsrMagic)
+    n, m, flags, kind, nt, nb = CsrHeader.unpack_from(self.mm, o)
+    o += CsrHeader.size
+    VE.__init__(self, bytes(buf[o:o + nt]).decode())
+    o += nt + pad(nt)
+
+    def view(tc: str, k: int) -> memoryview:
+      nonlocal o
+      v = buf[o:o + k * struct.calcsize(tc)].cast(tc)
+      o += len(v) * v.itemsize + pad(len(v) * v.itemsize)
+      return v
+
+    self.off = view("q", n + 1)
+    self.toff = view("q", n + 1)
+    self.dst = view("i", m)
+    self.wgt = view("d", m) if flags & CsrWgt else None
+    self.cap = view("d", m) if flags & CsrFlo else None
+    self.flo = view("d", m) if flags & CsrFlo else None
+    self.blob = buf[o:o + nb]
+    self.kind = CsrKinds[kind]
+    self.rev = None
+    self.roff = None
+    self.src = None
+    self.srt = None
+
+  def vtag(self, i: int) -> Tag: return bytes(self.blob[self.toff[i]:self.toff[i + 1]]).decode()
+
+  @cached_property
+  def vl(self) -> [Vert]: return [self.kind(self.vtag(i)) for i in range(len(self.off) - 1)]
+  @cached_property
+  def vv(self) -> VSet: return {u.tag: u for u in self.vl}
+  @cached_property
+  def ids(self) -> {Tag, int}: return {u.tag: i for i, u in enumerate(self.vl)}
+  @cached_property
+  def cls(self) -> bytearray: return bytearray(b"X" * len(self.dst))
+
+  def numVV(self) -> int: return len(self.off) - 1
+
+def openCsr(path: str) -> MapGraph:
+  # map the file written by saveCsr, without reading the arrays; processes that open the same file share its pages
+  return MapGraph(path)
@@ -0,0 +1,108 @@
+"""
+This module contains tests for the loaders and the CSR file format implemented in the load module.
+
+Author: Amen Zwa, Esq.
+Copyright sOnit, Inc. 2023
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from clrs.asp import ASPGraph, aspFloydWarshall
+from clrs.csr import csr
+from clrs.ega import bfs
+from clrs.flow import FlowGraph, flowValue, mfEdmondsKarp
+from clrs.load import loadDimacs, loadEdgeList, loadMetis, openCsr, saveCsr
+from clrs.mst import MSTGraph, mstKruskal
+from clrs.ssp import DijkstraGraph, SSPGraph, sspBellmanFord, sspDijkstra
+
+## loaders
+
+class LoadTestCase(TestCase):
+  d: tempfile.TemporaryDirectory
+
+  def setUp(self) -> None:
+    self.d = tempfile.TemporaryDirectory()
+
+  def tearDown(self) -> None:
+    self.d.cleanup()
+
+  def write(self, name: str, text: str) -> str:
+    path = os.path.join(self.d.name, name)
+    with open(path, "w") as f: f.write(text)
+    return path
+
+  def testEdgeList(self) -> None:
+    # Figure 22.4 p.613
+    path = self.write("bf.csv", "u,v,w\ns,t,6\ns,y,7\nt,x,5\nt,y,8\nt,z,-4\nx,t,-2\ny,x,-3\ny,z,9\nz,s,2\nz,x,7\n")
+    g = loadEdgeList(path, SSPGraph("CSV Bellman-Ford"), sep=",", header=True)
+    assert (g.numVV() == 5 and g.numEE() == 10)
+    sspBellmanFord(g, g.getV("s"))
+    dd = {"s": 0, "t": 2, "x": 4, "y": 7, "z": -2}  # see Figure 22.4(e) p.613
+    for u in g.getVV(): assert (u.dis == dd[u.tag])
+    # Figure 23.4 p.660
+    path = self.write("fw.txt", "# u v w\n1 2 3\n1 3 8\n1 5 -4\n2 4 1\n2 5 7\n3 2 4\n4 1 2\n4 3 -5\n5 4 6\n")
+    g = loadEdgeList(path, ASPGraph("Edge-list Floyd-Warshall"))
+    dd, _ = aspFloydWarshall(g)
+    ii = [g.ix[vtag] for vtag in ["1", "2", "3", "4", "5"]]  # vertices are numbered in order of first appearance
+    assert ([dd[ii[0]][j] for j in ii] == [0, 1, -3, 2, -4] and [dd[ii[4]][j] for j in ii] == [8, 5, 1, 6, 0])
+    print(g)
+
+  def testDimacs(self) -> None:
+    # Figure 24.6 p.687, with s = 1, v1..v4 = 2..5, and t = 6
+    path = self.write("ek.max", "c Figure 24.6\np max 6 9\nn 1 s\nn 6 t\n"
+      "a 1 2 16\na 1 3 13\na 2 4 12\na 3 2 4\na 3 5 14\na 4 3 9\na 4 6 20\na 5 4 7\na 5 6 4\n")
+    fn, s, t = loadDimacs(path, FlowGraph("DIMACS Edmonds-Karp"))
+    assert (flowValue(mfEdmondsKarp(fn, s, t), s) == 23.0)
+    # Figure 22.6 p.621, with s, t, x, y, z = 1..5
+    path = self.write("dj.gr", "p sp 5 10\na 1 2 10\na 1 4 5\na 2 3 1\na 2 4 2\na 3 5 4\na 4 2 3\na 4 3 9\na 4 5 2\na 5 1 7\na 5 3 6\n")
+    g, s, t = loadDimacs(path, DijkstraGraph("DIMACS Dijkstra"))
+    assert (s is None and t is None)
+    sspDijkstra(g, g.getV("1"))
+    assert ([u.dis for u in g.getVV()] == [0, 8, 9, 5, 7])
+
+  def testDimacsParallel(self) -> None:
+    # parallel arcs add their capacities in a flow network, and keep the least weight otherwise
+    path = self.write("par.max", "p max 3 3\nn 1 s\nn 3 t\na 1 2 5\na 1 2 7\na 2 3 20\n")
+    fn, s, t = loadDimacs(path, FlowGraph("DIMACS parallel arcs"))
+    assert (fn.numEE() == 2 and fn.getE("1-2").cap == 12.0)
+    assert (flowValue(mfEdmondsKarp(fn, s, t), s) == 12.0)
+    path = self.write("par.gr", "p sp 3 4\na 1 2 5\na 1 2 3\na 1 2 7\na 2 3 1\n")
+    g, s, _ = loadDimacs(path, DijkstraGraph("DIMACS parallel arcs"))
+    assert (g.numEE() == 2 and g.getE("1-2").wgt == 3.0)
+    sspDijkstra(g, g.getV("1"))
+    assert ([u.dis for u in g.getVV()] == [0, 3, 4])
+
+  def testMetis(self) -> None:
+    # Figure 21.1 p.586, with a..i = 1..9
+    path = self.write("mst.graph", "% Figure 21.1\n9 14 001\n"
+      "2 4 8 8\n1 4 3 8 8 11\n2 8 4 7 6 4 9 2\n3 7 5 9 6 14\n4 9 6 10\n3 4 4 14 5 10 7 2\n6 2 8 1 9 6\n1 8 2 11 7 1 9 7\n3 2 7 6 8 7\n")
+    g = loadMetis(path, MSTGraph("METIS Kruskal"))
+    assert (g.numVV() == 9 and g.numEE() == 28)
+    t = mstKruskal(g)
+    assert (sum([e.wgt for e in t.getEE()]) == 37.0)  # see Figure 21.4 p.592
+
+  def testMetisVertexSizes(self) -> None:
+    # path 1 - 2 - 3, with vertex sizes, then with vertex sizes and 2 vertex weights, ahead of the neighbours
+    for hdr, vw in [("3 2 100", ["5", "7", "9"]), ("3 2 110 2", ["5 1 1", "7 2 2", "9 3 3"])]:
+      path = self.write("sizes.graph", f"{hdr}\n{vw[0]} 2\n{vw[1]} 1 3\n{vw[2]} 2\n")
+      g = loadMetis(path, SSPGraph("METIS sizes"))
+      assert (sorted(g.vv) == ["1", "2", "3"])
+      assert (sorted([e.tag for e in g.getEE()]) == ["1-2", "2-1", "2-3", "3-2"])
+
+  def testCsrFile(self) -> None:
+    path = self.write("dj.gr", "p sp 5 10\na 1 2 10\na 1 4 5\na 2 3 1\na 2 4 2\na 3 5 4\na 4 2 3\na 4 3 9\na 4 5 2\na 5 1 7\na 5 3 6\n")
+    g, _, _ = loadDimacs(path, DijkstraGraph("CSR file Dijkstra"))
+    saveCsr(g, os.path.join(self.d.name, "dj.csr"))
+    c = openCsr(os.path.join(self.d.name, "dj.csr"))
+    assert (c.tag == csr(g).tag and c.numVV() == 5 and c.numEE() == 10)
+    sspDijkstra(g, g.getV("1"))
+    sspDijkstra(c, c.getV("1"))
+    for u in g.getVV(): assert (c.getV(u.tag).dis == u.dis)
+    bfs(c, c.getV("1"))
+    fn, s, t = loadDimacs(self.write("ek.max", "p max 4 5\nn 1 s\nn 4 t\na 1 2 3\na 1 3 2\na 2 3 1\na 2 4 2\na 3 4 3\n"), FlowGraph("CSR file"))
+    saveCsr(fn, os.path.join(self.d.name, "ek.csr"))
+    c = openCsr(os.path.join(self.d.name, "ek.csr"))
+    assert (flowValue(mfEdmondsKarp(c, c.getV("1"), c.getV("4")), c.getV("1")) == 5.0)
+    print(c)
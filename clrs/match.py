@@ -6,12 +6,19 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
-from clrs.util import DSet, Infinity, Tag
-from clrs.graph import Edge, LstGraph, Vert, makeETag, parseETag
+import math
+from collections import deque
+
+import numpy as np
+
+from clrs.util import Infinity, Option, Tag
+from clrs.graph import ESet, LstGraph, parseETag
+from clrs.flow import FlowEdge
+from clrs.mst import WgtEdge
 
 ## matching bipartite graph
 
-class MatchGraph(LstGraph):  # uses FlowEdge
+class MatchGraph(LstGraph):  # uses FlowEdge, or WgtEdge for assignment; edges run from left vertices L to right vertices R
   def __init__(self, tag: Tag):
     super().__init__(tag)
 
@@ -22,21 +29,194 @@ class MatchGraph(LstGraph):  # uses FlowEdge
     for etag in et:
       [utag, vtag] = parseETag(etag)
       e = FlowEdge(self.getV(utag), self.getV(vtag), float(ec[etag]))
-      self.ee[e.tag] = e
+      self.insE(e)
+
+  def makeVEw(self, vt: [Tag], et: [Tag], ew: {Tag, float}) -> None:
+    self.makeV(vt)
+    self.makeEw(et, ew)
+  def makeEw(self, et: [Tag], ew: {Tag, float}) -> None:
+    for etag in et:
+      [utag, vtag] = parseETag(etag)
+      e = WgtEdge(self.getV(utag), self.getV(vtag), float(ew[etag]))
+      self.insE(e)
 
 ## Hopcroft-Karp algorithm p.709
 
-def mfHopcroftKarp(fn: FlowGraph, s: Vert, t: Vert) -> FlowGraph:
-  def augPath(rn: FlowGraph, s: Vert, t: Vert) -> [FlowEdge]:
-    # find an augmenting path from vertex s to vertex t in residual network rn; see p.681
-    vv = list(reversed(rn.pathSV(s, t)))
-    return list(map(lambda uv: rn.getE(makeETag(uv[0], uv[1])), zip(vv, vv[1:])))
+def mfHopcroftKarp(g: MatchGraph) -> ESet:
+  # maximum matching of bipartite graph g; matched edges carry flow 1
+  def augPath(l: int) -> bool:
+    # find, by DFS along the layers, an augmenting path from free left vertex l that is vertex-disjoint from the earlier ones
+    ss = [l]  # left vertices of the path
+    while ss:
+      l = ss[-1]
+      if it[l] == len(aa[l]):  # dead end: no augmenting path passes through l in this phase
+        dl[l] = -1
+        ss.pop()
+        continue
+      r = aa[l][it[l]]
+      it[l] += 1
+      if mt[r] < 0:
+        if dl[l] + 1 != dd: continue
+        # augment the matching by the path; see p.708
+        for l in ss:
+          r = aa[l][it[l] - 1]
+          mt[l] = r
+          mt[r] = l
+        return True
+      if dl[mt[r]] == dl[l] + 1: ss.append(mt[r])
+    return False
 
-  # initialize
+  vv = g.getVV()
+  ix = {u.tag: i for i, u in enumerate(vv)}
+  aa = [[ix[e.v.tag] for e in g.outE(u)] for u in vv]  # adjacent right vertices of left vertices
+  ll = [i for i in range(len(vv)) if aa[i]]  # left vertices
+  mt = [-1] * len(vv)  # mates
+  while True:
+    # layer the left vertices by BFS along alternating paths from the free left vertices; see p.710
+    dl = [-1] * len(vv)  # layers of left vertices
+    dd = Infinity  # length of the shortest augmenting paths, in left vertices
+    q = deque()
+    for l in ll:
+      if mt[l] < 0:
+        dl[l] = 0
+        q.append(l)
+    while q:
+      l = q.popleft()
+      if dl[l] + 1 >= dd: continue
+      for r in aa[l]:
+        if mt[r] < 0: dd = dl[l] + 1
+        elif dl[mt[r]] < 0:
+          dl[mt[r]] = dl[l] + 1
+          q.append(mt[r])
+    if dd == Infinity: break
+    # enlarge the matching by a maximal set of vertex-disjoint shortest augmenting paths
+    it = [0] * len(vv)  # current arcs
+    for l in ll:
+      if mt[l] < 0: augPath(l)
   m: ESet = {}  # matching
-  # enlarge matching
-  while p := mfEdmondsKarp(fn, s, t):
-    # TODO
-    pass
-  fn.tag = f"{fn.tag}⇆"
-  return fn
+  for e in g.getEE(): e.flo = 0.0
+  for l in ll:
+    if mt[l] >= 0:
+      e = g.getE(vv[l], vv[mt[l]])
+      e.flo = 1.0
+      m[e.tag] = e
+  g.tag = f"{g.tag}⇆"
+  return m
+
+## §25.3 The Hungarian algorithm for the assignment problem p.723
+
+def asgHungarian(cc: [[float]]) -> [[int], float]:
+  # minimum-cost assignment of the n rows to distinct columns of the n×m cost matrix cc, n <= m, in O(n²m);
+  # each row in turn is matched by a shortest augmenting path over reduced costs c(i, j) - u(i) - v(j), with the potentials u, v
+  # kept feasible throughout; Infinity marks forbidden pairs; returns the column of each row and the total cost
+  n = len(cc)
+  m = len(cc[0]) if n > 0 else 0
+  u = [0.0] * (n + 1)  # row potentials, 1-based
+  v = [0.0] * (m + 1)  # column potentials, 1-based; column 0 is a virtual column holding the row being matched
+  p = [0] * (m + 1)  # row matched to each column, 0 if none
+  way = [0] * (m + 1)  # previous column on the augmenting path
+  for i in range(1, n + 1):
+    p[0] = i
+    j0 = 0
+    minv = [math.inf] * (m + 1)  # least reduced cost of reaching each column
+    used = [False] * (m + 1)  # columns on the alternating tree
+    while True:
+      used[j0] = True
+      i0 = p[j0]
+      delta = math.inf
+      j1 = 0
+      for j in range(1, m + 1):
+        if not used[j]:
+          c = cc[i0 - 1][j - 1]
+          cur = (math.inf if c == Infinity else c) - u[i0] - v[j]
+          if cur < minv[j]:
+            minv[j] = cur
+            way[j] = j0
+          if minv[j] < delta:
+            delta = minv[j]
+            j1 = j
+      if delta == math.inf: raise Exception("no assignment of finite cost")
+      for j in range(0, m + 1):
+        if used[j]:
+          u[p[j]] += delta
+          v[j] -= delta
+        else: minv[j] -= delta
+      j0 = j1
+      if p[j0] == 0: break  # reached a free column
+    while j0:  # augment along the path back to the virtual column
+      j1 = way[j0]
+      p[j0] = p[j1]
+      j0 = j1
+  aa = [0] * n
+  for j in range(1, m + 1):
+    if p[j]: aa[p[j] - 1] = j - 1
+  return aa, sum([cc[i][aa[i]] for i in range(n)])
+
+def mwHungarian(g: MatchGraph) -> [ESet, float]:
+  # minimum-weight matching of bipartite graph g that matches every left vertex; g uses WgtEdge
+  vv = g.getVV()
+  ll = [u for u in vv if g.outE(u)]  # left vertices
+  rt = {e.v.tag for u in ll for e in g.outE(u)}
+  rr = [v for v in vv if v.tag in rt]  # right vertices
+  ri = {v.tag: j for j, v in enumerate(rr)}
+  cc = [[Infinity] * len(rr) for _ in ll]
+  for i, u in enumerate(ll):
+    for e in g.outE(u): cc[i][ri[e.v.tag]] = e.wgt
+  aa, c = asgHungarian(cc)
+  m: ESet = {}  # matching
+  for i, j in enumerate(aa):
+    e = g.getE(ll[i], rr[j])
+    m[e.tag] = e
+  g.tag = f"{g.tag}⇆"
+  return m, c
+
+class Hungarian:  # dense assignment solver on NumPy arrays; buffers are allocated once and reused by every solve of the same shape
+  def __init__(self, n: int, m: Option[int] = None):
+    self.alloc(n, m or n)
+
+  def alloc(self, n: int, m: int) -> None:
+    self.n = n
+    self.m = m
+    self.u = np.zeros(n + 1)
+    self.v = np.zeros(m + 1)
+    self.p = np.zeros(m + 1, dtype=np.intp)
+    self.way = np.zeros(m + 1, dtype=np.intp)
+    self.minv = np.empty(m + 1)
+    self.used = np.empty(m + 1, dtype=bool)
+    self.aa = np.empty(n, dtype=np.intp)
+
+  def solve(self, cc: np.ndarray) -> [np.ndarray, float]:
+    # the same shortest augmenting paths as asgHungarian, with each scan over the columns vectorized; np.inf marks forbidden pairs
+    n, m = cc.shape
+    if (n, m) != (self.n, self.m): self.alloc(n, m)
+    u, v, p, way, minv, used = self.u, self.v, self.p, self.way, self.minv, self.used
+    u[:] = 0.0
+    v[:] = 0.0
+    p[:] = 0
+    for i in range(1, n + 1):
+      p[0] = i
+      j0 = 0
+      minv[:] = np.inf
+      used[:] = False
+      while True:
+        used[j0] = True
+        i0 = p[j0]
+        cur = cc[i0 - 1] - u[i0] - v[1:]
+        better = ~used[1:] & (cur < minv[1:])
+        minv[1:][better] = cur[better]
+        way[1:][better] = j0
+        j1 = int(np.argmin(np.where(used[1:], np.inf, minv[1:]))) + 1
+        delta = minv[j1]
+        if used[j1] or delta == np.inf: raise Exception("no assignment of finite cost")
+        u[p[used]] += delta
+        v[used] -= delta
+        minv[~used] -= delta
+        j0 = j1
+        if p[j0] == 0: break  # reached a free column
+      while j0:  # augment along the path back to the virtual column
+        j1 = way[j0]
+        p[j0] = p[j1]
+        j0 = j1
+    jj = np.nonzero(p[1:])[0]
+    self.aa[p[1:][jj] - 1] = jj
+    return self.aa.copy(), float(cc[np.arange(n), self.aa].sum())
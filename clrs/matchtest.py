@@ -5,10 +5,13 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
+from itertools import permutations
 from unittest import TestCase
 
 from clrs.graph import draw
-from clrs.match import MatchGraph, mfHopcroftKarp
+import numpy as np
+
+from clrs.match import Hungarian, MatchGraph, asgHungarian, mfHopcroftKarp, mwHungarian
 
 ## Hopcroft-Karp maximum bipartite matching
 
@@ -32,20 +35,56 @@ class HopcroftKarpMFTestCase(TestCase):
     "l5-r4": 1, "l5-r5": 1, "l5-r6": 1, "l5-r7": 1,
     "l6-r3": 1, "l6-r7": 1,
     "l7-r5": 1, "l7-r8": 1, }
-  fn = FlowGraph("dummy")
+  g = MatchGraph("dummy")
 
   def setUp(self) -> None:
-    self.fn = FlowGraph("Hopcroft-Karp")
-    self.fn.makeVEc(self.vt, self.et, self.ec)
+    self.g = MatchGraph("Hopcroft-Karp")
+    self.g.makeVEc(self.lt + self.rt, self.et, self.ec)
 
   def tearDown(self) -> None:
     pass
 
   def testHopcroftKarp(self) -> None:
-    print(self.fn)
-    draw(self.fn, directed=True, label=f"{self.fn.tag} flow network").render(f"viz-{self.fn.tag}")
-    s = self.fn.getV("s")
-    t = self.fn.getV("t")
-    mf = mfHopcroftKarp(self.fn, s, t)
-    print(mf)
-    draw(mf, directed=True, label=f"{mf.tag} Maximum Bipartite Matching").render(f"viz-{mf.tag}")
+    print(self.g)
+    draw(self.g, directed=True, label=f"{self.g.tag} bipartite graph").render(f"viz-{self.g.tag}")
+    m = mfHopcroftKarp(self.g)
+    assert (len(m) == 7)  # see Figure 25.2 p.710
+    assert (len({e.u for e in m.values()}) == len(m) and len({e.v for e in m.values()}) == len(m))  # edges of m share no vertex
+    print(self.g)
+    draw(self.g, directed=True, label=f"{self.g.tag} Maximum Bipartite Matching").render(f"viz-{self.g.tag}")
+
+## Hungarian minimum-weight assignment
+
+class HungarianTestCase(TestCase):
+  lt = ["w1", "w2", "w3", "w4"]  # workers
+  rt = ["j1", "j2", "j3", "j4"]  # jobs
+  cc = [  # costs
+    [9, 2, 7, 8],
+    [6, 4, 3, 7],
+    [5, 8, 1, 8],
+    [7, 6, 9, 4], ]
+  g = MatchGraph("dummy")
+
+  def setUp(self) -> None:
+    self.g = MatchGraph("Hungarian")
+    et = [f"{l}-{r}" for l in self.lt for r in self.rt]
+    self.g.makeVEw(self.lt + self.rt, et, {f"{self.lt[i]}-{self.rt[j]}": self.cc[i][j] for i in range(4) for j in range(4)})
+
+  def tearDown(self) -> None:
+    pass
+
+  def testHungarian(self) -> None:
+    m, c = mwHungarian(self.g)
+    assert (c == 13.0 and sorted(m.keys()) == ["w1-j2", "w2-j1", "w3-j3", "w4-j4"])
+    print(self.g)
+    for e in m.values(): print(f"  {e}")
+
+  def testHungarianDense(self) -> None:
+    h = Hungarian(6)
+    rg = np.random.default_rng(0)
+    for _ in range(20):  # repeated solves reuse the buffers of h
+      cc = rg.integers(0, 50, size=(6, 6)).astype(np.float64)
+      aa, c = h.solve(cc)
+      assert (c == min([sum([cc[i][j] for i, j in enumerate(pp)]) for pp in permutations(range(6))]))
+      assert (sorted(aa.tolist()) == list(range(6)))
+      assert (asgHungarian(cc.tolist())[1] == c)
@@ -6,14 +6,13 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
-from queue import PriorityQueue
-
-from clrs.graph import ESet, Edge, LstGraph, LstTree, Vert, makeETag, parseETag
-from clrs.util import DSet, Infinity, Tag
+from clrs.graph import Edge, LstGraph, LstTree, Vert, parseETag
+from clrs.util import DForest, Infinity, PQueue, Tag
 
 ## weighted edge
 
 class WgtEdge(Edge):
+  __slots__ = ("wgt",)
   def __init__(self, u: Vert, v: Vert, wgt: float = Infinity):
     super().__init__(u, v)
     self.wgt: float = wgt
@@ -35,23 +34,23 @@ class MSTGraph(LstGraph):  # uses WgtEdge
     for etag in et:
       [utag, vtag] = parseETag(etag)
       e = WgtEdge(self.getV(utag), self.getV(vtag), float(ew[etag]))
-      self.ee[e.tag] = e
+      self.insE(e)
 
 ## Kruskal's MST algorithm p.592
 
 def mstKruskal(g: MSTGraph) -> LstTree:
   # initialize
-  a: ESet = {}  # edge set of MST
-  ds = DSet(attr=lambda e: e.wgt)  # forests disjoint set
+  a: [WgtEdge] = []  # edges of MST
+  ds = DForest()  # forests disjoint set
   for u in g.getVV(): ds.makeSet(u)
   # discover MST in graph g
   for e in sorted(g.getEE(), key=lambda e: e.wgt):  # edges ascending sorted by their weights
     if ds.findSet(e.u) != ds.findSet(e.v):
-      a[e.tag] = e
+      a.append(e)
       ds.union(e.u, e.v)
   # extract MST t from graph g using tree edge set a
   t = LstTree(f"{g.tag}†")
-  for e in a.values():
+  for e in a:
     t.insE(e)
     t.insV(e.u)
     t.insV(e.v)
@@ -60,6 +59,7 @@ def mstKruskal(g: MSTGraph) -> LstTree:
 ## prioritized vertex
 
 class PriVert(Vert):
+  __slots__ = ("pri",)
   def __init__(self, tag: Tag):
     super().__init__(tag)
     self.pri: float = Infinity
@@ -68,7 +68,7 @@ class PriVert(Vert):
   def __str__(self) -> str: return f"{super().__str__()} {self.priority()}"
   def priority(self) -> str: return f"{self.pri if self.pri != Infinity else ''}"
 
-  def __lt__(self, v: "PriVert") -> bool: return self.pri < v.pri  # needed by PriorityQueue
+  def __lt__(self, v: "PriVert") -> bool: return self.pri < v.pri
 
 ## Prim MST graph with prioritized vertices
 
@@ -78,6 +78,7 @@ class PrimGraph(MSTGraph):  # uses PriVert and WgtEdge
 
   def makeV(self, vt: [Tag]) -> None:
     for vtag in vt: self.vv[vtag] = PriVert(vtag)
+    self.touch()
 
 ## Prim's MST algorithm p.594
 
@@ -87,20 +88,20 @@ def mstPrim(g: MSTGraph, r: PriVert) -> LstTree:
     u.par = None
     u.pri = Infinity
   r.pri = 0.0
-  q = PriorityQueue()
-  for u in g.getVV(): q.put(u)
+  q = PQueue(attr=lambda u: u.pri)
+  for u in g.getVV(): q.ins(u)
   # discover MST in graph g
   while not q.empty():
-    u = q.get()
-    for v in g.adj(u):
-      e = g.getE(makeETag(u, v))
-      if v in q.queue and e.wgt < v.pri:
+    u = q.extMin()
+    for e in g.outE(u):
+      v = e.v
+      if q.contains(v) and e.wgt < v.pri:
         v.par = u
         v.pri = e.wgt
-        q.queue.sort()  # rearrange q to account for decreased v.pri
+        q.decKey(v)  # rearrange q to account for decreased v.pri
   # extract MST t from graph g using tree vertices vv
   t = LstTree(f"{g.tag}†")
   for v in g.getVV():
     t.insV(v)
-    if not v.isRoot(): t.insE(g.getE(makeETag(v, v.par)))  # see p.596
+    if not v.isRoot(): t.insE(g.getE(v, v.par))  # see p.596
   return t
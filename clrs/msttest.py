@@ -47,6 +47,7 @@ class MSTTestCase(TestCase):
     print(self.g)
     draw(self.g, directed=False, label=f"{self.g.tag} connected, undirected graph").render(f"viz-{self.g.tag}")
     t = mstKruskal(self.g)
+    assert (t.numEE() == t.numVV() - 1 and sum([e.wgt for e in t.getEE()]) == 37.0)  # see Figure 21.4 p.592
     print(t)
     draw(t, directed=False, label=f"{t.tag} Minimum Spanning Tree").render(f"viz-{t.tag}Kruskal")
 
@@ -54,5 +55,6 @@ class MSTTestCase(TestCase):
     self.g = PrimGraph("Prim")
     self.g.makeVEw(self.vt, self.et, self.ew)
     t = mstPrim(self.g, self.g.getV("a"))
+    assert (t.numEE() == t.numVV() - 1 and sum([e.wgt for e in t.getEE()]) == 37.0)  # see Figure 21.5 p.595
     print(t)
     draw(t, directed=False, label=f"{t.tag} Minimum Spanning Tree").render(f"viz-{t.tag}Prim")
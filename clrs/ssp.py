@@ -6,14 +6,25 @@ Author: Amen Zwa, Esq.
 Copyright sOnit, Inc. 2023
 """
 
+import math
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
-from queue import PriorityQueue
+from multiprocessing import Value
+from multiprocessing.sharedctypes import Synchronized
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
 
-from clrs.graph import LstTree, Vert, makeETag
+import numpy as np
+
+from clrs.csr import CsrGraph, csr
+from clrs.graph import LstTree, Vert
 from clrs.ega import tsort
 from clrs.mst import MSTGraph, PrimGraph, PriVert, WgtEdge
 
-from clrs.util import Infinity, Option
+from clrs.util import Infinity, Option, PQueue, Tag, isNone
 
 ## SSP directed, weighted graph
 
@@ -30,7 +41,8 @@ def relax(e: WgtEdge) -> bool:
   # return True if v.dis is decreased, False otherwise; see pp.610,620
   u = e.u
   v = e.v
-  d = u.dis + round(e.wgt)
+  if u.dis == Infinity: return False  # ∞ + w = ∞
+  d = u.dis + e.wgt
   if v.dis > d:
     v.par = u
     v.dis = d
@@ -39,7 +51,7 @@ def relax(e: WgtEdge) -> bool:
 
 def shortestPathWeight(g: SSPGraph, s: Vert, v: Vert) -> float:
   # δ(u, v); see p.604
-  return reduce(lambda acc, w: acc + w, [g.getE(makeETag(u.par, u)).wgt for u in g.pathSV(s, v)], 0.0)
+  return reduce(lambda acc, w: acc + w, [g.getE(u.par, u).wgt for u in g.pathSV(s, v)], 0.0)
 
 ## §22.1 Bellman-Ford algorithm p.612
 
@@ -48,15 +60,68 @@ def sspBellmanFord(g: SSPGraph, s: Vert) -> Option[LstTree]:
   sspInit(g, s)
   # relax edges
   n = g.numVV()
+  ee = g.getEE()
   for i in range(1, n):  # iteration i ∈ [1, n)
-    for e in g.getEE(): relax(e)
+    if not reduce(lambda acc, e: relax(e) or acc, ee, False): break  # a pass without relaxation leaves nothing to relax
   # check for negative-weight cycle
-  for e in g.getEE():
+  for e in ee:
     u = e.u
     v = e.v
-    if v.dis > u.dis + e.wgt: return None  # found negative-weight cycle reachable from vertex s
+    if u.dis != Infinity and v.dis > u.dis + e.wgt: return None  # found negative-weight cycle reachable from vertex s
   return getSSP(g, s)  # extract SSP p from graph g
 
+def sspBellmanFordCycle(g: SSPGraph, s: Vert) -> [Option[LstTree], [Vert]]:
+  # Bellman-Ford that stops after the first pass without relaxation, and returns either the SSP and [],
+  # or None and a negative-weight cycle reachable from vertex s, as the vertex list of its path v0 ⇝ v0
+  sspInit(g, s)
+  n = g.numVV()
+  ee = g.getEE()
+  for i in range(1, n):  # iteration i ∈ [1, n)
+    if not reduce(lambda acc, e: relax(e) or acc, ee, False): return getSSP(g, s), []
+  for e in ee:
+    if relax(e): return None, negCycle(e.v)
+  return getSSP(g, s), []
+
+def negCycle(v: Vert) -> [Vert]:
+  # the cycle of parent pointers reached from vertex v, as the vertex list of its path v0 ⇝ v0, or [] if the parent
+  # pointers lead back to the source
+  seen = set()
+  while v is not None and v.tag not in seen:
+    seen.add(v.tag)
+    v = v.par
+  if v is None: return []
+  cc = [v]
+  u = v.par
+  while u != v:
+    cc.append(u)
+    u = u.par
+  cc.append(v)
+  return cc[::-1]
+
+def sspSPFA(g: SSPGraph, s: Vert) -> [Option[LstTree], [Vert]]:
+  # queue-based Bellman-Ford (Shortest Path Faster Algorithm) that relaxes only the edges leaving vertices whose v.dis
+  # decreased; a vertex whose shortest path reaches n edges lies on or behind a negative-weight cycle;
+  # returns either the SSP and [], or None and a negative-weight cycle reachable from vertex s
+  sspInit(g, s)
+  n = g.numVV()
+  k: {Tag, int} = {s.tag: 0}  # number of edges on the current path s ⇝ v
+  q = deque([s])
+  inq = {s.tag}  # vertices in q
+  while q:
+    u = q.popleft()
+    inq.discard(u.tag)
+    for e in g.outE(u):
+      if relax(e):
+        v = e.v
+        k[v.tag] = k[u.tag] + 1
+        if k[v.tag] >= n:
+          cc = negCycle(v)
+          if cc: return None, cc
+        if v.tag not in inq:
+          inq.add(v.tag)
+          q.append(v)
+  return getSSP(g, s), []
+
 def getSSP(g: SSPGraph, s: Vert | PriVert) -> LstTree:
   p = LstTree(f"{g.tag}¶")
   p.insV(s)
@@ -64,10 +129,7 @@ def getSSP(g: SSPGraph, s: Vert | PriVert) -> LstTree:
     if u != s:
       p.insV(u)
     if not u.isRoot():
-      etag = makeETag(u.par, u)
-      if g.hasE(etag):
-        e = g.getE(etag)
-        p.insE(e)
+      if g.hasE(u.par, u): p.insE(g.getE(u.par, u))
   return p
 
 ## §22.2 Single-source shortest paths in directed acyclic graphs
@@ -78,7 +140,7 @@ def sspBellmanFordDAWG(g: SSPGraph, s: Vert) -> Option[LstTree]:
   sspInit(g, s)
   # relax edges
   for u in vv:  # for each topologically sorted vertex
-    for v in g.adj(u): relax(g.getE(makeETag(u, v)))
+    for e in g.outE(u): relax(e)
   return getSSP(g, s)
 
 ## §22.3 Dijkstra's algorithm p.620
@@ -90,16 +152,213 @@ def sspDijkstra(g: SSPGraph, s: PriVert) -> LstTree:
   # initialize
   sspInit(g, s)
   b: VSet = {}  # vertex set of SSP
-  q = PriorityQueue()
+  q = PQueue(attr=lambda u: u.pri)
   for u in g.getVV():
     u.pri = 0.0 if u == s else Infinity
-    q.put(u)
+    q.ins(u)
   # discover SSP in graph g
   while not q.empty():
-    u = q.get()
+    u = q.extMin()
     b[u.tag] = u
-    for v in g.adj(u):
-      if relax(g.getE(makeETag(u, v))):
+    for e in g.outE(u):
+      if relax(e):
+        v = e.v
         v.pri = float(v.dis)
-        q.queue.sort()  # rearrange q to account for decreased v.dis
+        q.decKey(v)  # rearrange q to account for decreased v.dis
   return getSSP(g, s)
+
+## Δ-stepping
+
+dsArrays: Option[tuple] = None  # (slot, (off, dst, wgt, dis, cd, cp)) views of the shared arrays, in each worker process
+dsShm: [SharedMemory] = []  # shared memory blocks attached by each worker process
+DsCodes = "qidd"  # typecodes of the shared off, dst, wgt, and dis arrays, each followed by "di" for the cd and cp of a slot
+
+def dsInit(names: [str], n: int, m: int, slots: Synchronized) -> None:
+  # attach the shared CSR arrays and distances, and the candidate arrays of the next free slot
+  global dsArrays, dsShm
+  with slots.get_lock():
+    w = slots.value
+    slots.value += 1
+  dsShm = [SharedMemory(name=name) for name in names[:4] + names[4 + 2 * w:6 + 2 * w]]
+  dsArrays = w, tuple(sm.buf.cast(tc)[:k] for sm, tc, k in zip(dsShm, DsCodes + "di", [n + 1, m, m, n, n, n]))
+
+def dsRelax(aa: tuple, uu: [int], light: bool, Δ: float) -> [int]:
+  # relax the light (w ≤ Δ) or heavy (w > Δ) edges leaving the vertices uu into the candidate distances cd and parents cp,
+  # which hold Infinity for no candidate; returns the targets given their first candidate, the distances are only read
+  off, dst, wgt, dd, cd, cp = aa
+  tt = []
+  for u in uu:
+    du = dd[u]
+    for k in range(off[u], off[u + 1]):
+      w = wgt[k]
+      if (w <= Δ) == light:
+        v = dst[k]
+        dv = du + w
+        if dv < dd[v] and dv < cd[v]:
+          if cd[v] == math.inf: tt.append(v)
+          cd[v] = dv
+          cp[v] = u
+  return tt
+
+def dsWork(args: [[int], bool, float]) -> [int, bytes]: return dsArrays[0], array("i", dsRelax(dsArrays[1], *args)).tobytes()
+
+def sspDeltaStep(g: SSPGraph, s: Vert, Δ: Option[float] = None, workers: Option[int] = None, grain: int = 4096) -> LstTree:
+  # Δ-stepping: the tentative distances are kept in buckets of width Δ; the least non-empty bucket is emptied by relaxing
+  # the light edges of its vertices, repeatedly as relaxations refill it, and then the heavy edges of all the vertices it
+  # held; a phase with at least grain vertices is relaxed by a process pool over the CSR arrays and the distances in
+  # shared memory, each worker process into candidate arrays of its own, so that only the ids of the targets it reached
+  # cross back, and are merged by vectorized comparison; edge weights must be non-negative; Δ defaults to the greatest
+  # weight over the mean out degree
+  c = g if isinstance(g, CsrGraph) else csr(g)
+  n = c.numVV()
+  m = c.numEE()
+  wgt = c.wgt if c.wgt is not None else array("d", [1.0] * m)
+  assert (min(wgt, default=0.0) >= 0.0)
+  Δ = Δ or (max(wgt, default=0.0) / max(1.0, m / max(1, n))) or 1.0
+  workers = workers or os.cpu_count() or 1
+  ex: Option[ProcessPoolExecutor] = None
+  hh: [SharedMemory] = []
+  if workers > 1 and m >= grain:
+    xx = [c.off, c.dst, wgt, array("d", [math.inf] * n)] + [array("d", [math.inf] * n), array("i", bytes(4 * n))] * workers
+    hh = [SharedMemory(create=True, size=max(1, len(a) * a.itemsize)) for a in xx]
+    for sm, a in zip(hh, xx): sm.buf[:len(a) * a.itemsize] = a.tobytes()
+    xx = [sm.buf.cast(tc)[:len(a)] for sm, tc, a in zip(hh, DsCodes + "di" * workers, xx)]
+    ex = ProcessPoolExecutor(max_workers=workers, initializer=dsInit, initargs=([sm.name for sm in hh], n, m, Value("i", 0)))
+  else: xx = [c.off, c.dst, wgt, array("d", [math.inf] * n)]
+  xx += [array("d", [math.inf] * n), array("i", bytes(4 * n))]  # candidates of the parent process, in the last slot
+  aa = tuple(xx[:4])
+  ss = [(xx[k], xx[k + 1]) for k in range(4, len(xx), 2)]  # candidate slots (cd, cp)
+  me = len(ss) - 1
+  dd = aa[3]
+  nd = np.frombuffer(dd, dtype=np.float64)
+  ns = [(np.frombuffer(cd, dtype=np.float64), np.frombuffer(cp, dtype=np.int32)) for cd, cp in ss]
+  pp = np.full(n, -1, dtype=np.int32)  # predecessor ids
+
+  def requests(uu: [int], light: bool) -> [[int, np.ndarray]]:
+    if isNone(ex) or len(uu) < grain: return [(me, np.array(dsRelax(aa + ss[me], uu, light, Δ), dtype=np.int32))]
+    k = -(-len(uu) // (4 * workers))  # several chunks per worker balance the load
+    return [(w, np.frombuffer(tt, dtype=np.int32)) for w, tt in ex.map(dsWork, [(uu[i:i + k], light, Δ) for i in range(0, len(uu), k)])]
+
+  bb: {int, set} = {}  # buckets {i: vertices v with i·Δ ≤ v.dis < (i + 1)·Δ}
+  def merge(rr: [[int, np.ndarray]]) -> None:
+    for w, tt in rr:
+      cd, cp = ns[w]
+      dv = cd[tt]
+      cd[tt] = np.inf  # the slot holds no candidate again
+      k = dv < nd[tt]
+      tt = tt[k]
+      dv = dv[k]
+      for v, d in zip(tt.tolist(), dv.tolist()):  # move v to the bucket of its new distance
+        if dd[v] != math.inf and (b := bb.get(int(dd[v] // Δ))) is not None: b.discard(v)
+        bb.setdefault(int(d // Δ), set()).add(v)
+      nd[tt] = dv
+      pp[tt] = cp[tt]
+
+  try:
+    i = c.ids[s.tag]
+    dd[i] = 0.0
+    bb[0] = {i}
+    while bb:
+      b = min(bb)
+      rr = []  # vertices settled in bucket b
+      while bb.get(b):
+        uu = list(bb.pop(b))
+        rr.extend(uu)
+        merge(requests(uu, True))
+      bb.pop(b, None)
+      merge(requests(rr, False))
+    # copy the distances and parents back to graph g
+    vv = g.getVV()
+    for i, (d, p) in enumerate(zip(nd.tolist(), pp.tolist())):
+      vv[i].dis = Infinity if d == math.inf else d
+      vv[i].par = vv[p] if p >= 0 else None
+  finally:
+    if ex is not None:
+      ex.shutdown()
+      nd = ns = None  # drop the exports of the shared buffers before releasing them
+      for a in xx[:-2]: a.release()
+      for sm in hh:
+        sm.close()
+        sm.unlink()
+  return getSSP(g, s)
+
+## point-to-point shortest paths
+
+def sspBidirectional(g: SSPGraph, s: PriVert, t: PriVert) -> [[Vert], float]:
+  # bidirectional Dijkstra: a forward search from s over out edges, in u.dis and u.par, and a backward search from t over in
+  # edges, in db and pb, stopped once the least keys of the two queues add up to at least μ, the weight of the best path
+  # through a vertex reached by both searches; edge weights must be non-negative; returns the path s ⇝ t and its weight,
+  # or [] and Infinity if t is unreachable; only the vertices reached by the forward search hold valid v.dis and v.par
+  ff = {s.tag}  # vertices reached forward
+  s.dis = 0
+  s.par = None
+  s.pri = 0.0
+  db: {Tag, float} = {t.tag: 0.0}  # distance v ⇝ t
+  pb: {Tag, Vert} = {}  # successor of v on the path v ⇝ t
+  qf = PQueue(attr=lambda u: u.pri)
+  qf.ins(s)
+  qb = PQueue(attr=lambda u: db[u.tag])
+  qb.ins(t)
+  μ = 0.0 if s == t else Infinity
+  m = s  # meeting vertex
+  while not qf.empty() and not qb.empty() and qf.minimum().pri + db[qb.minimum().tag] < μ:
+    if qf.size() <= qb.size():  # advance the smaller frontier
+      u = qf.extMin()
+      for e in g.outE(u):
+        v = e.v
+        if v.tag not in ff:
+          ff.add(v.tag)
+          v.dis = Infinity
+          v.par = None
+        if relax(e):
+          v.pri = float(v.dis)
+          if qf.contains(v): qf.decKey(v)
+          else: qf.ins(v)
+        if v.tag in db and v.dis + db[v.tag] < μ:
+          μ = v.dis + db[v.tag]
+          m = v
+    else:
+      v = qb.extMin()
+      for e in g.inE(v):
+        u = e.u
+        d = db[v.tag] + e.wgt
+        if d < db.get(u.tag, Infinity):
+          db[u.tag] = d
+          pb[u.tag] = v
+          if qb.contains(u): qb.decKey(u)
+          else: qb.ins(u)
+        if u.tag in ff and u.dis + db[u.tag] < μ:
+          μ = u.dis + db[u.tag]
+          m = u
+  if μ == Infinity: return [], Infinity
+  vv = g.pathSV(s, m)[::-1]
+  while m != t:
+    m = pb[m.tag]
+    vv.append(m)
+  return vv, μ
+
+def sspAStar(g: SSPGraph, s: PriVert, t: PriVert, heuristic: Callable[[Vert], float]) -> [[Vert], float]:
+  # A* search: Dijkstra's algorithm keyed on v.pri = v.dis + h(v), stopped once t is settled; the heuristic h must not
+  # overestimate the distance v ⇝ t, and a vertex is reopened when its v.dis decreases after it was settled, so that
+  # h needs not be consistent; h = 0 gives Dijkstra's algorithm; returns the path s ⇝ t and its weight, or [] and
+  # Infinity if t is unreachable; only the vertices reached by the search hold valid v.dis and v.par
+  ff = {s.tag}  # vertices reached
+  s.dis = 0
+  s.par = None
+  s.pri = heuristic(s)
+  q = PQueue(attr=lambda u: u.pri)
+  q.ins(s)
+  while not q.empty():
+    u = q.extMin()
+    if u == t: return g.pathSV(s, t)[::-1], t.dis
+    for e in g.outE(u):
+      v = e.v
+      if v.tag not in ff:
+        ff.add(v.tag)
+        v.dis = Infinity
+        v.par = None
+      if relax(e):
+        v.pri = v.dis + heuristic(v)
+        if q.contains(v): q.decKey(v)
+        else: q.ins(v)
+  return [], Infinity
@@ -7,8 +7,8 @@ Copyright sOnit, Inc. 2023
 
 from unittest import TestCase
 
-from clrs.graph import draw
-from clrs.ssp import DijkstraGraph, SSPGraph, sspBellmanFord, sspBellmanFordDAWG, sspDijkstra
+from clrs.graph import draw, makeETag
+from clrs.ssp import DijkstraGraph, SSPGraph, sspAStar, sspBellmanFord, sspBellmanFordCycle, sspBellmanFordDAWG, sspBidirectional, sspDeltaStep, sspDijkstra, sspSPFA
 from clrs.util import isSome
 
 ## Bellman-Ford SSP
@@ -46,6 +46,21 @@ class BellmanFordSSPTestCase(TestCase):
       print(p)
       draw(p, directed=True, label=f"{p.tag} Single-Source Shortest Path").render(f"viz-{p.tag}")
 
+  def testBellmanFordCycle(self) -> None:
+    dd = {"s": 0, "t": 2, "x": 4, "y": 7, "z": -2}  # see Figure 22.4(e) p.613
+    for f in [sspBellmanFordCycle, sspSPFA]:
+      p, cc = f(self.g, self.g.getV("s"))
+      assert (isSome(p) and cc == [])
+      for u in self.g.getVV(): assert (u.dis == dd[u.tag])
+    # negative-weight cycles, e.g. t → x → t
+    g = SSPGraph("Bellman-Ford negative cycle")
+    g.makeVEw(self.vt, self.et, {**self.ew, "x-t": -6})
+    for f in [sspBellmanFordCycle, sspSPFA]:
+      p, cc = f(g, g.getV("s"))
+      assert (p is None and cc[0] == cc[-1])
+      assert (sum([g.getE(makeETag(cc[i], cc[i + 1])).wgt for i in range(len(cc) - 1)]) < 0)
+      print(f"{g.tag}: {' → '.join([u.tag for u in cc])}")
+
 class BellmanFordDAWGTestCase(TestCase):
   # Figure 22.5 p.618
   vt = ["r", "s", "t", "x", "y", "z"]
@@ -108,5 +123,28 @@ class DijkstraSSPTestCase(TestCase):
     draw(self.g, directed=True, label=f"{self.g.tag} directed, weighted graph").render(f"viz-{self.g.tag}")
     s = self.g.getV("s")
     p = sspDijkstra(self.g, s)
+    dd = {"s": 0, "t": 8, "x": 9, "y": 5, "z": 7}  # see Figure 22.6(f) p.621
+    pp = {"t": "y", "x": "t", "y": "s", "z": "y"}
+    for u in self.g.getVV():
+      assert (u.dis == dd[u.tag])
+      assert (u.isRoot() or u.par.tag == pp[u.tag])
     print(p)
     draw(p, directed=True, label=f"{p.tag} Single-Source Shortest Path").render(f"viz-{p.tag}")
+
+  def testDeltaStep(self) -> None:
+    dd = {"s": 0, "t": 8, "x": 9, "y": 5, "z": 7}  # see Figure 22.6(f) p.621
+    pp = {"t": "y", "x": "t", "y": "s", "z": "y"}
+    for Δ, workers in [(None, 1), (2.0, 2)]:
+      p = sspDeltaStep(self.g, self.g.getV("s"), Δ=Δ, workers=workers, grain=1)
+      for u in self.g.getVV():
+        assert (u.dis == dd[u.tag])
+        assert (u.isRoot() or u.par.tag == pp[u.tag])
+    print(p)
+
+  def testPointToPoint(self) -> None:
+    s = self.g.getV("s")
+    x = self.g.getV("x")
+    h = {"s": 9, "t": 1, "x": 0, "y": 4, "z": 6}  # lower bounds on the distance v ⇝ x
+    for pp, w in [sspBidirectional(self.g, s, x), sspAStar(self.g, s, x, lambda v: 0.0), sspAStar(self.g, s, x, lambda v: h[v.tag])]:
+      assert ([v.tag for v in pp] == ["s", "y", "t", "x"] and w == 9)
+    assert (sspBidirectional(self.g, x, s)[1] == 11 and sspAStar(self.g, x, x, lambda v: 0.0) == ([x], 0))
@@ -18,7 +18,8 @@ def todo() -> None: raise Exception("to do")
 
 Tag = str  # label
 
-class Tagged:  # base for tagged types
+class Tagged:  # base for tagged types; subclasses declare their slots, starting with tag, to carry no per-instance __dict__
+  __slots__ = ()
   def __init__(self, tag: Tag):
     self.tag = tag
 
@@ -65,39 +66,149 @@ class SSet:  # sorted set
 
   def contains(self, i: α) -> bool: return i in self.ii
 
-class DSet:  # disjoint sets (a collection of sorted sets)
+class DSet:  # disjoint sets (a collection of sorted sets), kept on top of a disjoint-set forest
   def __init__(self, attr: Callable[[float], float]):
     super().__init__()
-    self.ss: {str, SSet} = {}  # {str(rep): SSet}
+    self.df = DForest()
+    self.ss: {int, SSet} = {}  # {root id in df: SSet}
     self.attr = attr
 
   def getSS(self) -> [SSet]:
     return list(self.ss.values())
 
   def makeSet(self, x: α) -> None:
-    s = self.findSet(x)
-    if isNone(s):  # x is not in the collection
-      s = SSet([x], attr=self.attr)
-      self.ss[s.getRep()] = s
+    if not self.df.contains(x):  # x is not in the collection
+      self.df.makeSet(x)
+      self.ss[self.df.ii[x]] = SSet([x], attr=self.attr)
 
   def findSet(self, x: α) -> Option[SSet]:
-    ss = [s for s in self.getSS() if s.contains(x)]
-    return ss[0] if ss != [] else None
+    return self.ss[self.df.find(self.df.ii[x])] if self.df.contains(x) else None
 
   def union(self, x: α, y: α) -> SSet:
-    if x == y: return self.findSet(x)
-    sx = self.findSet(x)
-    sy = self.findSet(y)
-    if sx == sy: return sx
-    ii = []
-    if isSome(sx):
-      self.ss.pop(sx.getRep())
-      ii += sx.getII()
-    if isSome(sy):
-      self.ss.pop(sy.getRep())
-      ii += sy.getII()
-    su = SSet(ii, attr=self.attr)
-    self.ss[su.getRep()] = su
-
-### PQueue
+    self.makeSet(x)
+    self.makeSet(y)
+    a = self.df.find(self.df.ii[x])
+    b = self.df.find(self.df.ii[y])
+    if a == b: return self.ss[a]
+    sa = self.ss.pop(a)
+    sb = self.ss.pop(b)
+    self.df.union(x, y)
+    su, sv = (sa, sb) if len(sa.ii) >= len(sb.ii) else (sb, sa)
+    su.ii |= sv.ii  # merge the smaller set into the larger one
+    self.ss[self.df.find(a)] = su
+    return su
+
+### §19.3 Disjoint-set forests p.527
+
+class DForest:  # disjoint-set forest with union by rank and path compression
+  def __init__(self):
+    super().__init__()
+    self.xx: [α] = []  # items indexed by id
+    self.ii: {α, int} = {}  # {item: id}
+    self.pp: [int] = []  # parent ids
+    self.rr: [int] = []  # ranks
+    self.nn: [int] = []  # set sizes, valid at roots
+    self.nx: [int] = []  # next member ids; the members of each set form a circular list
+
+  def contains(self, x: α) -> bool: return x in self.ii
+  def numSets(self) -> int: return sum(1 for i, p in enumerate(self.pp) if i == p)
 
+  def makeSet(self, x: α) -> None:
+    if self.contains(x): return
+    i = len(self.xx)
+    self.xx.append(x)
+    self.ii[x] = i
+    self.pp.append(i)
+    self.rr.append(0)
+    self.nn.append(1)
+    self.nx.append(i)
+
+  def find(self, i: int) -> int:
+    # root id of the tree containing id i, compressing the find path; see p.530
+    r = i
+    while self.pp[r] != r: r = self.pp[r]
+    while self.pp[i] != r: self.pp[i], i = r, self.pp[i]
+    return r
+  def findSet(self, x: α) -> α: return self.xx[self.find(self.ii[x])]  # representative of the set containing x
+
+  def union(self, x: α, y: α) -> α:
+    # link the roots by rank; see p.530
+    a = self.find(self.ii[x])
+    b = self.find(self.ii[y])
+    if a == b: return self.xx[a]
+    if self.rr[a] < self.rr[b]: a, b = b, a
+    self.pp[b] = a
+    if self.rr[a] == self.rr[b]: self.rr[a] += 1
+    self.nn[a] += self.nn[b]
+    self.nx[a], self.nx[b] = self.nx[b], self.nx[a]  # splice the two circular member lists
+    return self.xx[a]
+
+  def size(self, x: α) -> int: return self.nn[self.find(self.ii[x])]
+  def members(self, x: α) -> [α]:
+    i = j = self.ii[x]
+    mm = []
+    while True:
+      mm.append(self.xx[j])
+      j = self.nx[j]
+      if j == i: return mm
+
+### Chapter 6 Heapsort §6.5 Priority queues p.172
+
+class PQueue:  # min-priority queue (an indexed binary heap with decrease-key)
+  def __init__(self, attr: Callable[[α], float]):
+    super().__init__()
+    self.hh: [α] = []  # binary min-heap of items
+    self.ii: {α, int} = {}  # {item: index of item in hh}
+    self.nn: {α, int} = {}  # {item: insertion number}, which breaks ties between equal keys
+    self.n = 0  # number of insertions
+    self.attr = attr  # key selector
+
+  def empty(self) -> bool: return not self.hh
+  def size(self) -> int: return len(self.hh)
+  def contains(self, x: α) -> bool: return x in self.ii
+  def minimum(self) -> α: return self.hh[0]
+
+  def ins(self, x: α) -> None:
+    self.nn[x] = self.n
+    self.n += 1
+    self.hh.append(x)
+    self.ii[x] = len(self.hh) - 1
+    self.siftUp(len(self.hh) - 1)
+  def extMin(self) -> α:
+    # see p.173
+    x = self.hh[0]
+    y = self.hh.pop()
+    self.ii.pop(x)
+    self.nn.pop(x)
+    if self.hh:
+      self.hh[0] = y
+      self.ii[y] = 0
+      self.siftDown(0)
+    return x
+  def decKey(self, x: α) -> None: self.siftUp(self.ii[x])  # the key of x has just been decreased; see p.175
+
+  def less(self, x: α, y: α) -> bool:
+    kx = self.attr(x)
+    ky = self.attr(y)
+    return kx < ky or (kx == ky and self.nn[x] < self.nn[y])
+  def swap(self, i: int, j: int) -> None:
+    hh = self.hh
+    hh[i], hh[j] = hh[j], hh[i]
+    self.ii[hh[i]] = i
+    self.ii[hh[j]] = j
+  def siftUp(self, i: int) -> None:
+    # see p.175
+    while i > 0 and self.less(self.hh[i], self.hh[p := (i - 1) // 2]):
+      self.swap(i, p)
+      i = p
+  def siftDown(self, i: int) -> None:
+    # see MIN-HEAPIFY p.165
+    n = len(self.hh)
+    while True:
+      l = 2 * i + 1
+      r = l + 1
+      m = l if l < n and self.less(self.hh[l], self.hh[i]) else i
+      if r < n and self.less(self.hh[r], self.hh[m]): m = r
+      if m == i: return
+      self.swap(i, m)
+      i = m
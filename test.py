@@ -12,7 +12,12 @@ from clrs.egatest import BFSTestCase, DFSTestCase, SCCTestCase, TSortTestCase
 from clrs.msttest import MSTTestCase
 from clrs.ssptest import BellmanFordDAWGTestCase, BellmanFordSSPTestCase, DijkstraSSPTestCase
 from clrs.asptest import FloydWarshallASPTestCase, JohnsonTestCase, TransitiveClosureTestCase
-from clrs.flowtest import EdmondsKarpMFTestCase
+from clrs.flowtest import DinicMFTestCase, EdmondsKarpMFTestCase, PushRelabelMFTestCase
+from clrs.matchtest import HopcroftKarpMFTestCase, HungarianTestCase
+from clrs.csrtest import CsrGraphTestCase
+from clrs.chtest import CHTestCase
+from clrs.loadtest import LoadTestCase
+from clrs.cachetest import CacheTestCase
 from unittest import main
 
 if __name__ == '__main__': main()